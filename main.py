@@ -1,11 +1,30 @@
 """Minimal launcher for ImBridge GUI (keeps startup logic only)."""
+import argparse
 
 
 def main():
+    parser = argparse.ArgumentParser(description="ImBridge")
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="print import and construction times once the window is shown",
+    )
+    args = parser.parse_args()
+
+    from src.utils.startup_timer import startup_timer
+
     # Import here to keep startup lightweight for non-GUI operations
-    from src.app import App
+    with startup_timer.measure("import src.app"):
+        from src.app import App
+
+    with startup_timer.measure("App()"):
+        app = App()
+    if args.startup_report:
+        def report():
+            startup_timer.mark("first paint")
+            print(startup_timer.report())
 
-    app = App()
+        app.after_idle(report)
     app.mainloop()
 
 
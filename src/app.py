@@ -1,22 +1,34 @@
 import tkinter as tk
 from tkinter import ttk
 import tkinter.font as tkfont
-from PIL import Image, ImageTk
+import importlib
 import logging
-import shutil, os
+import os
 import sys
 from tkinter import messagebox
 
-from src.tabs.qr_tab import QRTab
-from src.tabs.signature_tab import SignatureTab
-from src.tabs.share_tab import ShareTab
-from src.tabs.fetch_tab import FetchTab
-from src.tabs.scan_tab import ScanTab
-from src.tabs.about_tab import AboutTab
 from src.frames.server_frame import ServerFrame
 from src.frames.tool_frame import ToolFrame
 
 from src.utils.logger import Logger
+from src.utils.cache_manager import CacheManager
+from src.utils.startup_timer import startup_timer
+from src.utils.tls import can_generate_certificate
+
+# Cached uploads are kept across runs within this budget
+CACHE_MAX_BYTES = 2 * 1024 ** 3
+CACHE_TTL = 7 * 24 * 3600
+
+# (attribute, label, module, class); each tab is imported and built the first time it is selected
+TABS = [
+    ("qr_tab", " QR Generator ", "src.tabs.qr_tab", "QRTab"),
+    ("scan_tab", " Remote Scan ", "src.tabs.scan_tab", "ScanTab"),
+    # SignatureTab only handles logic and callbacks, does not directly hold CanvasFrame
+    ("signature_tab", " Draw & Sign ", "src.tabs.signature_tab", "SignatureTab"),
+    ("shr_tab", " File Share ", "src.tabs.share_tab", "ShareTab"),
+    ("ftc_tab", " File Fetch ", "src.tabs.fetch_tab", "FetchTab"),
+    ("abt_tab", " About ", "src.tabs.about_tab", "AboutTab"),
+]
 
 
 def init_styles():
@@ -36,7 +48,8 @@ class App(tk.Tk):
     """Modular App for ImBridge (signature-focused subset)."""
 
     def __init__(self):
-        super().__init__()
+        with startup_timer.measure("Tk root"):
+            super().__init__()
 
         init_styles()
         self.title("ImBridge")
@@ -48,10 +61,20 @@ class App(tk.Tk):
             os.path.dirname(os.path.dirname(__file__)), "output"
         )
         self.cache_dir = os.path.join(self.output_dir, "cache")
-        # Bind window close event, clear cache on normal close
+        # Bind window close event, trim the cache to its budget on normal close
         self.protocol("WM_DELETE_WINDOW", self._on_app_exit)
-        self.build_content()
+        with startup_timer.measure("cache index"):
+            self.cache_manager = CacheManager(
+                self.cache_dir, CACHE_MAX_BYTES, CACHE_TTL, log_func=self.log
+            )
+        with startup_timer.measure("build window"):
+            self.build_content()
+        self.server_frame._server_manager.cache_dir = self.cache_dir
+        self.server_frame._server_manager.cache_manager = self.cache_manager
         self.check_ssl_certificates()
+        # Server events (uploads, pushes) are delivered to the tabs on the Tk thread
+        self._server_events = self.server_frame._server_manager.events.subscribe()
+        self.after(250, self._dispatch_server_events)
 
     def build_content(self):
         # Main frame, divided into upper and lower parts, using grid for layout
@@ -82,9 +105,11 @@ class App(tk.Tk):
         row_1.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(8, 0))
         row_1.columnconfigure(0, weight=1)
         row_1.columnconfigure(1, weight=1)
-        self.server_frame = ServerFrame(row_1)
+        with startup_timer.measure("ServerFrame"):
+            self.server_frame = ServerFrame(row_1)
         self.server_frame.grid(row=0, column=0, sticky="nsew")
-        self.tool_frame = ToolFrame(row_1)
+        with startup_timer.measure("ToolFrame"):
+            self.tool_frame = ToolFrame(row_1)
         self.tool_frame.grid(row=0, column=1, sticky="nsew")
 
         row_2 = ttk.Frame(bottom_frame)
@@ -113,26 +138,34 @@ class App(tk.Tk):
         row_2.columnconfigure(0, weight=1)
         row_2.columnconfigure(1, weight=1)
 
-        self.qr_tab = QRTab(self.nb)
-        self.nb.add(self.qr_tab, text=" QR Generator ")
-        self.scan_tab = ScanTab(self.nb)
-        self.nb.add(self.scan_tab, text=" Remote Scan ")
-        # SignatureTab only handles logic and callbacks, does not directly hold CanvasFrame
-        self.signature_tab = SignatureTab(self.nb)
-        self.nb.add(self.signature_tab, text=" Draw & Sign ")
-        self.shr_tab = ShareTab(self.nb)
-        self.nb.add(self.shr_tab, text=" File Share ")
-        self.ftc_tab = FetchTab(self.nb)
-        self.nb.add(self.ftc_tab, text=" File Fetch ")
-        self.abt_tab = AboutTab(self.nb)
-        self.nb.add(self.abt_tab, text=" About ")
+        self._tab_slots = {}
+        for attr, text, module, cls in TABS:
+            slot = ttk.Frame(self.nb)
+            self.nb.add(slot, text=text)
+            self._tab_slots[str(slot)] = (attr, module, cls)
+            setattr(self, attr, None)
 
         self.nb.select(0)
+        self.get_tab(self.nb.select())
+
+    def get_tab(self, tab_id):
+        """Return the tab shown in notebook pane `tab_id`, building it on first use."""
+        attr, module, cls = self._tab_slots[str(tab_id)]
+        tab = getattr(self, attr)
+        if tab is None:
+            with startup_timer.measure(f"tab {cls}"):
+                tab_cls = getattr(importlib.import_module(module), cls)
+                tab = tab_cls(self.nb.nametowidget(tab_id))
+                tab.pack(fill="both", expand=True)
+            setattr(self, attr, tab)
+        return tab
+
+    def built_tabs(self):
+        return [t for t in (getattr(self, attr) for attr, _, _, _ in TABS) if t is not None]
 
     def on_tab_changed(self, event=None):
         self.clear_preview()
-        current_tab_id = self.nb.select()
-        current_tab_obj = self.nb.nametowidget(current_tab_id)
+        current_tab_obj = self.get_tab(self.nb.select())
 
         if current_tab_obj in (self.qr_tab, self.abt_tab):
             self.server_frame.deactivate()
@@ -144,10 +177,22 @@ class App(tk.Tk):
         else:
             self.tool_frame.activate()
 
-    def image_preview(self, image: Image.Image):
+    def _dispatch_server_events(self):
+        for event in self._server_events.poll():
+            # Tabs that were never opened have nothing to update
+            for tab in self.built_tabs():
+                try:
+                    tab.on_server_event(event)
+                except Exception as e:
+                    self.logger.error(f"Failed to handle server event: {e}")
+        self.after(250, self._dispatch_server_events)
+
+    def image_preview(self, image):
         """
         Display imgtk in preview_frame and keep reference to prevent GC.
         """
+        from PIL import ImageTk
+
         self.clear_preview()
         if self.preview_frame:
             try:
@@ -171,21 +216,14 @@ class App(tk.Tk):
                 w.destroy()
 
     def _on_app_exit(self):
-        self.clear_output_cache()
+        try:
+            self.cache_manager.enforce()
+        except Exception as e:
+            self.log(logging.ERROR, f"Failed to trim output cache: {e}")
         self.destroy()
 
     def clear_output_cache(self):
-        cache_dir = self.cache_dir
-        if os.path.exists(cache_dir):
-            for f in os.listdir(cache_dir):
-                fp = os.path.join(cache_dir, f)
-                try:
-                    if os.path.isfile(fp) or os.path.islink(fp):
-                        os.unlink(fp)
-                    elif os.path.isdir(fp):
-                        shutil.rmtree(fp)
-                except Exception as e:
-                    self.log(logging.ERROR, f"Failed to delete {fp}: {e}")
+        self.cache_manager.clear()
 
     def log(self, level, msg):
         self.logger.log(level, msg)
@@ -197,6 +235,12 @@ class App(tk.Tk):
         cert_path = os.path.join(cert_dir, 'cert.pem')
         key_path = os.path.join(cert_dir, 'key.pem')
         if not (os.path.exists(cert_path) and os.path.exists(key_path)):
+            if can_generate_certificate():
+                self.log(
+                    logging.INFO,
+                    "No SSL certificate found; a self-signed one will be generated when the server starts.",
+                )
+                return
             msg = (
                 "SSL certificate files not found in " + cert_dir + ".\n"
                 "HTTPS features will NOT work.\n\n"
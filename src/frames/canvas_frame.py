@@ -104,7 +104,7 @@ class CanvasFrame(BaseFrame):
 
     def _on_scale_change(self, val):
         scale = float(val)
-        self.sig.canvas.scale(tk.ALL, 0, 0, scale, scale)
+        self.sig.scale_view(scale)
         w = self.canvas_width * self.canvas_scale.get()
         h = self.canvas_height * self.canvas_scale.get()
         self.sig.canvas.config(scrollregion=(0, 0, w, h))
@@ -128,6 +128,8 @@ class CanvasFrame(BaseFrame):
         )
 
     def clear_canvas(self):
+        # The cleared canvas is drawn at 100%; keep the zoom controls in step
+        self.reset_scale()
         self.sig.clear()
         self.sig.start()
 
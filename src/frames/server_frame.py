@@ -3,8 +3,11 @@ from tkinter import ttk
 import webbrowser
 import os
 import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
 
 from src.utils.server_manager import ServerManager
+from src.utils.net_interfaces import InterfaceMonitor
 from src.frames.labeled_validated_entry import LabeledValidatedEntry
 from src.frames.base_frame import BaseFrame
 from src.libs.qr import generate_qr_image
@@ -20,13 +23,17 @@ class ServerFrame(BaseFrame):
         self.host_ip = "127.0.0.1"
         self.port_var = tk.IntVar(value=5000)
         self._server_manager = ServerManager(log_func=self.log)
-        self.ip_options = [
-            ip for ip in self._server_manager.list_local_ips() if ip != self.host_ip
-        ]
-        self.ip_var = tk.StringVar(
-            value=self.ip_options[0] if self.ip_options else self.host_ip
-        )
+        # Interfaces are discovered in the background and fill the combobox as they arrive
+        self.ip_options = []
+        self.ip_var = tk.StringVar(value=self.host_ip)
+        self._ip_chosen = False  # True once the user picks an address themselves
+        self._busy = False  # a start or stop is in progress
+        self._qr_pool = ThreadPoolExecutor(1, thread_name_prefix="url-qr")
+        self._ip_updates = queue.Queue()
+        self._ip_monitor = InterfaceMonitor(on_change=self._ip_updates.put)
         self.build_contents()
+        self._ip_monitor.start()
+        self.after(100, self._poll_ip_updates)
 
     def build_contents(self):
 
@@ -36,13 +43,16 @@ class ServerFrame(BaseFrame):
         ttk.Label(self.main_frame, text="IP/Port:").pack(
             side="left", padx=(8, 8), pady=8
         )
-        ttk.Combobox(
+        self.ip_combo = ttk.Combobox(
             self.main_frame,
             values=self.ip_options,
             textvariable=self.ip_var,
             state="readonly",
             width=12,
-        ).pack(side="left", padx=0, pady=8)
+            postcommand=self._ip_monitor.refresh,
+        )
+        self.ip_combo.pack(side="left", padx=0, pady=8)
+        self.ip_combo.bind("<<ComboboxSelected>>", self._on_ip_selected)
         self.port_entry = LabeledValidatedEntry(
             self.main_frame,
             var=self.port_var,
@@ -78,6 +88,35 @@ class ServerFrame(BaseFrame):
         )
         self.server_btn.pack(side="left", padx=2)
 
+    def _poll_ip_updates(self):
+        latest = None
+        while True:
+            try:
+                latest = self._ip_updates.get_nowait()
+            except queue.Empty:
+                break
+        if latest is not None:
+            self.set_ip_options(latest)
+        self.after(500, self._poll_ip_updates)
+
+    def set_ip_options(self, ips):
+        """Show `ips` (best first) and pre-select the best unless the user chose one."""
+        self.ip_options = [ip for ip in ips if ip != self.host_ip]
+        self.ip_combo.config(values=self.ip_options)
+        # Keep the user's choice (and the address a running server is bound to)
+        current = self.ip_var.get()
+        if self._server_manager.is_running or (self._ip_chosen and current in self.ip_options):
+            return
+        best = self.ip_options[0] if self.ip_options else self.host_ip
+        if best != current:
+            self.ip_var.set(best)
+            probe = next((p for p in self._ip_monitor.probes if p.ip == best), None)
+            if probe and probe.latency_ms is not None:
+                self.log(logging.INFO, f"Selected {best} (reachable, {probe.latency_ms:.1f} ms)")
+
+    def _on_ip_selected(self, event=None):
+        self._ip_chosen = True
+
     def _update_status(self):
         if getattr(self._server_manager, "is_running", False):
             self.status_var.set("ON")
@@ -86,9 +125,9 @@ class ServerFrame(BaseFrame):
             self.status_var.set("OFF")
             self.status_entry.config(foreground="red")
 
-    def get_url(self):
+    def get_url(self, scheme=None):
         # Respect HTTP/HTTPS based on server's SSL context
-        scheme = getattr(self._server_manager, "scheme", "http")
+        scheme = scheme or getattr(self._server_manager, "scheme", "http")
         return f"{scheme}://{self.ip_var.get()}:{self.port_var.get()}/"
 
     def toggle_server(self):
@@ -98,31 +137,71 @@ class ServerFrame(BaseFrame):
                 logging.ERROR, "ServerManager instance missing! Cannot start server."
             )
             return
+        if self._busy:
+            return
+        self._busy = True
+        self.server_btn.config(state="disabled")
         if not self._server_manager.is_running:
-            self.log(logging.INFO, "Starting web server...May take several seconds...")
+            self.log(logging.INFO, "Starting web server...")
             try:
                 self._server_manager.host = self.ip_var.get()
                 self._server_manager.port = int(self.port_var.get())
-                self._server_manager.start()
-                self.server_btn.config(text="Stop Server")
-                self._update_status()
-                scheme = getattr(self._server_manager, "scheme", "http")
-                self.winfo_toplevel().image_preview(generate_qr_image(self.get_url()))
-                self.log(
-                    logging.INFO,
-                    f"Web server started at {scheme}://{self._server_manager.host}:{self._server_manager.port}/",
-                )
             except Exception as e:
-                self.log(logging.ERROR, f"Failed to start web server: {e}")
+                self._on_started(None, e)
+                return
+            # The server binds and loads TLS while the URL QR renders on another thread
+            url = self.get_url(self._server_manager.expected_scheme())
+            qr_future = self._qr_pool.submit(generate_qr_image, url)
+            self._when_done(
+                self._server_manager.start_async(),
+                lambda f: self._on_started(qr_future, f.exception()),
+            )
         else:
-            try:
-                self.winfo_toplevel().clear_preview()
-                self._server_manager.stop()
-                self.server_btn.config(text="Start Server")
-                self._update_status()
-                self.log(logging.INFO, "Web server stopped")
-            except Exception as e:
-                self.log(logging.ERROR, f"Failed to stop web server: {e}")
+            self.winfo_toplevel().clear_preview()
+            self._when_done(
+                self._server_manager.stop_async(),
+                lambda f: self._on_stopped(f.exception()),
+            )
+
+    def _when_done(self, future, callback, interval=20):
+        """Call `callback(future)` on the Tk thread once `future` has finished."""
+        if future.done():
+            callback(future)
+        else:
+            self.after(interval, self._when_done, future, callback, interval)
+
+    def _on_started(self, qr_future, error):
+        self._busy = False
+        self.server_btn.config(state="normal")
+        if error is not None:
+            self.log(logging.ERROR, f"Failed to start web server: {error}")
+            return
+        self.server_btn.config(text="Stop Server")
+        self._update_status()
+        self.log(
+            logging.INFO,
+            f"Web server started at {self._server_manager.get_base_url()}/",
+        )
+        self._when_done(qr_future, self._show_qr)
+
+    def _show_qr(self, qr_future):
+        # The server may have been stopped again while the QR was rendering
+        if not self._server_manager.is_running:
+            return
+        try:
+            self.winfo_toplevel().image_preview(qr_future.result())
+        except Exception as e:
+            self.log(logging.ERROR, f"Failed to render URL QR code: {e}")
+
+    def _on_stopped(self, error):
+        self._busy = False
+        self.server_btn.config(state="normal")
+        if error is not None:
+            self.log(logging.ERROR, f"Failed to stop web server: {error}")
+            return
+        self.server_btn.config(text="Start Server")
+        self._update_status()
+        self.log(logging.INFO, "Web server stopped")
 
     def _on_cache(self):
         cache = self._server_manager.latest_metadata
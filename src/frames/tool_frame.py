@@ -1,6 +1,5 @@
 from tkinter import ttk
 from src.frames.base_frame import BaseFrame
-from src.libs.converter import check_tool
 
 
 class ToolFrame(BaseFrame):
@@ -9,6 +8,8 @@ class ToolFrame(BaseFrame):
         self.build_contents()
 
     def build_contents(self):
+        from src.libs.converter import check_tool
+
         self.main_frame = ttk.LabelFrame(self, text="Tool Status")
         self.main_frame.pack(fill="x")
         tool_keys = [("potrace", "Potrace")]
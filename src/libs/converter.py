@@ -1,16 +1,585 @@
 """Bitmap conversion utilities.
 
 Uses Pillow for most bitmap format conversions and pillow-heif for HEIC/HEIF decoding.
+Vectorization runs potrace over pipes: the bitmap goes to its stdin and the
+vector document comes back on stdout, so no temporary files are involved and
+conversions can run concurrently. A bounded pool limits how many potrace
+processes run at once. Without potrace, a NumPy tracer takes over: it follows
+the pixel boundaries, simplifies the outlines and rounds gentle turns into
+curves while keeping sharp corners (QR modules stay square). It works on all
+outlines at once in NumPy and refuses bitmaps too intricate to trace that way.
+Either way the traced geometry is cached by content hash and serialized to the
+requested format on demand, so saving the same image again in another format
+skips the trace. NumPy is imported when an image is traced, not with this
+module, which the tool check loads at startup.
 """
-from PIL import Image
+import functools
+import io
 import os
 import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional, Callable
-import tempfile
+import hashlib
+import re
 import shutil
 import json
 import importlib
 
+from src.libs.lru import LRUCache
+
+VECTOR_FORMATS = ("eps", "svg", "pdf", "ps")
+POTRACE_WORKERS = max(1, min(4, os.cpu_count() or 1))
+POTRACE_TIMEOUT = 60
+# Traced geometries kept for re-export in another format
+VECTORIZE_CACHE_SIZE = 16
+
+_pool = None
+_pool_lock = threading.Lock()
+_trace_cache = LRUCache(VECTORIZE_CACHE_SIZE)
+_inflight = {}  # cache key -> Future of a trace in progress
+_inflight_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def find_executable(name: str) -> Optional[str]:
+    """shutil.which, memoized; call refresh_tools() after installing a tool."""
+    return shutil.which(name)
+
+
+def refresh_tools():
+    find_executable.cache_clear()
+
+
+def _potrace_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=POTRACE_WORKERS, thread_name_prefix="potrace")
+        return _pool
+
+
+def _pgm_bytes(gray) -> bytes:
+    """Encode a uint8 array as a binary PGM, the cheapest format potrace reads."""
+    h, w = gray.shape
+    return b"P5\n%d %d\n255\n" % (w, h) + gray.tobytes()
+
+
+def _run_potrace(data: bytes, out_fmt: str, turdsize: int, blacklevel: float) -> bytes:
+    potrace_exe = find_executable('potrace')
+    if not potrace_exe:
+        raise RuntimeError('potrace.exe not found in PATH; please install and configure the environment variable')
+    cmd = [
+        potrace_exe, '-b', out_fmt, '-t', str(turdsize), '-k', str(blacklevel), '-o', '-', '-'
+    ]
+    try:
+        proc = subprocess.run(cmd, input=data, capture_output=True, timeout=POTRACE_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise RuntimeError(f'potrace.exe failed: {e}')
+    if proc.returncode != 0:
+        err = proc.stderr.decode(errors='replace').strip()
+        raise RuntimeError(f'potrace.exe failed ({proc.returncode}): {err}')
+    return proc.stdout
+
+
+# Tracer settings for the built-in backend
+TRACE_TOLERANCE = 1.0  # max deviation in pixels when simplifying outlines
+TRACE_CORNER_COS = 0.2  # turns sharper than ~78 degrees stay corners, the rest become curves
+# Larger pixel boundaries are left to potrace: the outlines would outweigh the bitmap
+TRACE_MAX_EDGES = 3_000_000
+
+
+class VectorPaths:
+    """
+    Traced outlines of a bitmap, in pixel units with y pointing down.
+    Each path is (start point, segments); a segment is (x, y) for a line,
+    (cx, cy, x, y) for a quadratic or (c1x, c1y, c2x, c2y, x, y) for a cubic
+    curve. Paths are closed and filled even-odd.
+    """
+
+    def __init__(self, width: int, height: int, paths: list):
+        self.width = width
+        self.height = height
+        self.paths = paths
+
+    def to_svg(self) -> bytes:
+        d = []
+        for (x0, y0), segments in self.paths:
+            d.append(f"M{_num(x0)} {_num(y0)}")
+            for seg in segments:
+                cmd = {2: "L", 4: "Q", 6: "C"}[len(seg)]
+                d.append(cmd + " ".join(_num(v) for v in seg))
+            d.append("Z")
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.width}" height="{self.height}" '
+            f'viewBox="0 0 {self.width} {self.height}">\n'
+            f'<path fill="#000" fill-rule="evenodd" d="{"".join(d)}"/>\n</svg>\n'
+        ).encode("utf-8")
+
+    def draw_pdf_page(self, c):
+        """Draw the outlines as one page of a reportlab canvas."""
+        from reportlab.pdfgen import canvas
+
+        c.setPageSize((self.width, self.height))
+        c.saveState()
+        # Flip to the image coordinate system
+        c.transform(1, 0, 0, -1, 0, self.height)
+        path = c.beginPath()
+        for (x0, y0), segments in self.paths:
+            path.moveTo(x0, y0)
+            x, y = x0, y0
+            for seg in segments:
+                if len(seg) == 2:
+                    path.lineTo(*seg)
+                else:
+                    path.curveTo(*_as_cubic(x, y, seg))
+                x, y = seg[-2], seg[-1]
+            path.close()
+        c.drawPath(path, stroke=0, fill=1, fillMode=canvas.FILL_EVEN_ODD)
+        c.restoreState()
+        c.showPage()
+
+    def to_pdf(self) -> bytes:
+        return paths_to_pdf([self])
+
+    def to_ps(self, eps: bool = False) -> bytes:
+        lines = [
+            "%!PS-Adobe-3.0 EPSF-3.0" if eps else "%!PS-Adobe-3.0",
+            f"%%BoundingBox: 0 0 {self.width} {self.height}",
+            "%%Pages: 1",
+            "%%EndComments",
+            "gsave",
+            f"0 {self.height} translate 1 -1 scale",
+            "0 setgray",
+            "newpath",
+        ]
+        for (x0, y0), segments in self.paths:
+            lines.append(f"{_num(x0)} {_num(y0)} moveto")
+            x, y = x0, y0
+            for seg in segments:
+                if len(seg) == 2:
+                    lines.append(f"{_num(seg[0])} {_num(seg[1])} lineto")
+                else:
+                    lines.append(" ".join(_num(v) for v in _as_cubic(x, y, seg)) + " curveto")
+                x, y = seg[-2], seg[-1]
+            lines.append("closepath")
+        lines += ["eofill", "grestore"]
+        if not eps:
+            lines.append("showpage")
+        lines.append("%%EOF\n")
+        return "\n".join(lines).encode("ascii")
+
+    def render(self, out_fmt: str) -> bytes:
+        if out_fmt == "svg":
+            return self.to_svg()
+        if out_fmt == "pdf":
+            return self.to_pdf()
+        if out_fmt in ("eps", "ps"):
+            return self.to_ps(eps=out_fmt == "eps")
+        raise RuntimeError(f"Unsupported vector format: {out_fmt}")
+
+
+def paths_to_pdf(pages, out=None) -> Optional[bytes]:
+    """
+    A PDF with one page per VectorPaths. Written to `out` (path or binary
+    file) when given, else returned as bytes.
+    """
+    from reportlab.pdfgen import canvas
+
+    buf = out if out is not None else io.BytesIO()
+    c = canvas.Canvas(buf, pageCompression=1)
+    for page in pages:
+        page.draw_pdf_page(c)
+    c.save()
+    return None if out is not None else buf.getvalue()
+
+
+def _num(v: float) -> str:
+    return f"{v:.2f}".rstrip("0").rstrip(".")
+
+
+def _as_cubic(x0, y0, seg):
+    if len(seg) == 6:
+        return seg
+    cx, cy, x, y = seg
+    return (
+        x0 + 2 / 3 * (cx - x0), y0 + 2 / 3 * (cy - y0),
+        x + 2 / 3 * (cx - x), y + 2 / 3 * (cy - y),
+        x, y,
+    )
+
+
+def _crack_edges(dark):
+    """
+    Boundary edges between dark and light pixels, oriented so the dark side is
+    on the right, as arrays of start nodes (y * (w + 1) + x) and directions
+    (0 right, 1 down, 2 left, 3 up) sorted by start node. Nodes where two
+    diagonal pixels touch (saddles) start two edges.
+    """
+    import numpy as np
+
+    h, w = dark.shape
+    p = np.pad(dark, 1)
+    stride = w + 1
+    above, below = p[:-1, 1:-1], p[1:, 1:-1]  # horizontal edges, (h + 1) x w
+    left, right = p[1:-1, :-1], p[1:-1, 1:]  # vertical edges, h x (w + 1)
+    starts, dirs = [], []
+    ys, xs = np.nonzero(below & ~above)
+    starts.append(ys * stride + xs)
+    dirs.append(np.zeros(len(ys), dtype=np.int64))
+    ys, xs = np.nonzero(above & ~below)
+    starts.append(ys * stride + xs + 1)
+    dirs.append(np.full(len(ys), 2))
+    ys, xs = np.nonzero(left & ~right)
+    starts.append(ys * stride + xs)
+    dirs.append(np.ones(len(ys), dtype=np.int64))
+    ys, xs = np.nonzero(right & ~left)
+    starts.append((ys + 1) * stride + xs)
+    dirs.append(np.full(len(ys), 3))
+    starts = np.concatenate(starts)
+    dirs = np.concatenate(dirs)
+    order = np.argsort(starts, kind="stable")
+    return starts[order], dirs[order]
+
+
+def _link_outlines(starts, dirs, stride):
+    """
+    Link the edges into closed outlines, keeping only the corner nodes.
+    Returns the corners of all outlines back to back and the outline lengths.
+
+    Each edge continues with the one leaving its end node; at a saddle it
+    turns right when possible, which keeps diagonal dark pixels apart. The
+    outlines are the cycles of that successor map and are found for all edges
+    at once by pointer jumping, so the cost is a few NumPy passes per doubling
+    of the longest outline instead of a Python step per edge.
+    """
+    import numpy as np
+
+    n = len(starts)
+    index = np.arange(n)
+    ends = starts + np.array([1, stride, -1, -stride])[dirs]
+    first = np.searchsorted(starts, ends)
+    second = np.minimum(first + 1, n - 1)
+    saddle = (second != first) & (starts[second] == ends)
+    right, left = (dirs + 1) % 4, (dirs + 3) % 4
+    take_second = saddle & (dirs[first] != right) & ((dirs[second] == right) | (dirs[first] != left))
+    succ = np.where(take_second, second, first)
+    # Label every edge with the smallest edge index on its cycle
+    label, jump = index, succ
+    while True:
+        lowest = np.minimum(label, label[jump])
+        if np.array_equal(lowest, label):
+            break
+        label, jump = lowest, jump[jump]
+    # Open each cycle before its lowest edge and rank the edges by distance to that cut
+    last = succ == label
+    jump = np.where(last, index, succ)
+    rank = (~last).astype(np.int64)
+    while True:
+        ahead = jump[jump]
+        if np.array_equal(ahead, jump):
+            break
+        rank += rank[jump]
+        jump = ahead
+    order = np.lexsort((-rank, label))
+    # The end node of an edge is a corner when the next edge turns
+    order = order[dirs[succ[order]] != dirs[order]]
+    corners = ends[order]
+    label = label[order]
+    heads = np.flatnonzero(np.concatenate(([True], label[1:] != label[:-1])))
+    return corners, np.diff(np.append(heads, len(corners)))
+
+
+def _simplify_outlines(x, y, lengths, tolerance):
+    """
+    Douglas-Peucker on closed outlines stored back to back in `x`, `y`; returns
+    keep flags for the points. Each loop is split at its point farthest from
+    the start and both halves are simplified. The spans of all outlines are
+    refined together, one level of the recursion per NumPy pass.
+    """
+    import numpy as np
+
+    count = len(lengths)
+    offsets = np.cumsum(lengths) - lengths
+    outline = np.repeat(np.arange(count), lengths)
+    # Closed copies: every outline repeats its first point at the end
+    where = np.arange(len(x)) + outline
+    cx, cy = np.empty(len(x) + count), np.empty(len(x) + count)
+    cx[where], cy[where] = x, y
+    closing = offsets + lengths + np.arange(count)
+    cx[closing], cy[closing] = x[offsets], y[offsets]
+    heads = closing - lengths
+    d2 = (x - x[offsets][outline]) ** 2 + (y - y[offsets][outline]) ** 2
+    far = _first_max(d2, offsets, outline)[1] + np.arange(count)
+    keep = np.zeros(len(cx), dtype=bool)
+    keep[heads] = keep[far] = keep[closing] = True
+    i, j = np.concatenate((heads, far)), np.concatenate((far, closing))
+    while True:
+        inner = j - i >= 2
+        i, j = i[inner], j[inner]
+        if not len(i):
+            break
+        sizes = j - i - 1
+        first = np.cumsum(sizes) - sizes
+        span = np.repeat(np.arange(len(i)), sizes)
+        m = np.arange(len(span)) - first[span] + i[span] + 1
+        ax, ay = cx[i], cy[i]
+        dx, dy = cx[j] - ax, cy[j] - ay
+        norm = np.hypot(dx, dy)
+        px, py = cx[m] - ax[span], cy[m] - ay[span]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dist = np.where(
+                norm[span] == 0, np.hypot(px, py), np.abs(px * dy[span] - py * dx[span]) / norm[span]
+            )
+        best, k = _first_max(dist, first, span)
+        split = best > tolerance
+        k = m[k[split]]
+        keep[k] = True
+        i, j = np.concatenate((i[split], k)), np.concatenate((k, j[split]))
+    return keep[where]
+
+
+def _first_max(values, offsets, group):
+    """Per group of consecutive values: the maximum and the index of its first occurrence."""
+    import numpy as np
+
+    best = np.maximum.reduceat(values, offsets)
+    hits = np.where(values == best[group], np.arange(len(values)), len(values))
+    return best, np.minimum.reduceat(hits, offsets)
+
+
+def _outline_segments(x, y, lengths, corner_cos):
+    """Round the gentle turns of closed polygons (stored back to back) with quadratic curves."""
+    import numpy as np
+
+    offsets = np.cumsum(lengths) - lengths
+    nxt = np.arange(1, len(x) + 1)
+    nxt[offsets + lengths - 1] = offsets
+    prv = np.arange(-1, len(x) - 1)
+    prv[offsets] = offsets + lengths - 1
+    ax, ay, bx, by = x - x[prv], y - y[prv], x[nxt] - x, y[nxt] - y
+    cos = (ax * bx + ay * by) / np.maximum(np.hypot(ax, ay) * np.hypot(bx, by), 1e-9)
+    mx, my = (x + x[nxt]) / 2, (y + y[nxt]) / 2
+    corner = (cos <= corner_cos).tolist()
+    xs, ys, mxs, mys = x.tolist(), y.tolist(), mx.tolist(), my.tolist()
+    paths = []
+    for s, n in zip(offsets.tolist(), lengths.tolist()):
+        segments = []
+        for t in range(s, s + n):
+            if corner[t]:
+                segments.append((xs[t], ys[t]))
+                segments.append((mxs[t], mys[t]))
+            else:
+                segments.append((xs[t], ys[t], mxs[t], mys[t]))
+        paths.append(((mxs[s + n - 1], mys[s + n - 1]), segments))
+    return paths
+
+
+def trace_bitmap(
+    gray,
+    turdsize: int = 2,
+    blacklevel: float = 0.5,
+    tolerance: float = TRACE_TOLERANCE,
+    corner_cos: float = TRACE_CORNER_COS,
+) -> VectorPaths:
+    """
+    Trace a grayscale image (PIL "L" image or uint8 array) in process.
+    Pixels darker than `blacklevel` are ink; outlines enclosing at most
+    `turdsize` pixels are dropped as speckles, like potrace's -k and -t.
+    Raises RuntimeError for bitmaps with more than TRACE_MAX_EDGES boundary
+    edges, whose outlines would be larger than the bitmap itself.
+    """
+    import numpy as np
+
+    gray = np.asarray(gray)
+    h, w = gray.shape
+    stride = w + 1
+    starts, dirs = _crack_edges(gray < blacklevel * 255)
+    if len(starts) > TRACE_MAX_EDGES:
+        raise RuntimeError(
+            f"Image too complex for the built-in tracer ({len(starts)} pixel edges); "
+            "install potrace or save it as a bitmap"
+        )
+    if not len(starts):
+        return VectorPaths(w, h, [])
+    nodes, lengths = _link_outlines(starts, dirs, stride)
+    x, y = (nodes % stride).astype(float), (nodes // stride).astype(float)
+    # Drop speckles (shoelace areas of all outlines at once)
+    offsets = np.cumsum(lengths) - lengths
+    nxt = np.arange(1, len(x) + 1)
+    nxt[offsets + lengths - 1] = offsets
+    areas = np.abs(np.add.reduceat(x * y[nxt] - y * x[nxt], offsets)) / 2
+    big = areas > turdsize
+    if not big.any():
+        return VectorPaths(w, h, [])
+    points = np.repeat(big, lengths)
+    x, y, lengths = x[points], y[points], lengths[big]
+    keep = _simplify_outlines(x, y, lengths, tolerance)
+    kept = np.add.reduceat(keep, np.cumsum(lengths) - lengths, dtype=np.int64)
+    # Outlines smaller than the tolerance keep their pixel corners
+    keep |= np.repeat(kept < 3, lengths)
+    lengths = np.where(kept < 3, lengths, kept)
+    return VectorPaths(w, h, _outline_segments(x[keep], y[keep], lengths, corner_cos))
+
+
+def potrace_available() -> bool:
+    return find_executable('potrace') is not None
+
+
+_SVG_TOKEN = re.compile(r"[MmLlCcZz]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_SVG_TRANSFORM = re.compile(r'transform="translate\(([^,]+),([^)]+)\) scale\(([^,]+),([^)]+)\)"')
+
+
+def _parse_potrace_svg(svg: bytes, width: int, height: int) -> VectorPaths:
+    """
+    Read the outlines back from potrace's SVG output (M/m, L/l, C/c and z
+    commands under a translate/scale transform) into image coordinates.
+    """
+    text = svg.decode("utf-8", errors="replace")
+    m = _SVG_TRANSFORM.search(text)
+    tx, ty, sx, sy = (float(v) for v in m.groups()) if m else (0.0, 0.0, 1.0, 1.0)
+    paths = []
+    for d in re.findall(r'\sd="([^"]*)"', text):
+        tokens = _SVG_TOKEN.findall(d)
+        i = 0
+        cmd = None
+        x = y = start_x = start_y = 0.0
+        segments = None
+        while i < len(tokens):
+            if tokens[i].isalpha():
+                cmd = tokens[i]
+                i += 1
+                if cmd in "Zz":
+                    if segments is not None:
+                        paths.append(((start_x, start_y), segments))
+                        segments = None
+                    x, y = start_x, start_y
+                continue
+            n = 6 if cmd in "Cc" else 2
+            vals = [float(v) for v in tokens[i:i + n]]
+            if len(vals) < n:
+                raise RuntimeError("Unexpected potrace output")
+            i += n
+            if cmd.islower():
+                vals = [v + (x if k % 2 == 0 else y) for k, v in enumerate(vals)]
+            if cmd in "Mm":
+                if segments is not None:
+                    paths.append(((start_x, start_y), segments))
+                segments = []
+                start_x, start_y = vals
+                # Further pairs after a moveto are implicit linetos
+                cmd = "l" if cmd == "m" else "L"
+            else:
+                segments.append(tuple(vals))
+            x, y = vals[-2], vals[-1]
+        if segments:
+            paths.append(((start_x, start_y), segments))
+
+    def to_image(v, k):
+        return tx + sx * v if k % 2 == 0 else ty + sy * v
+
+    paths = [
+        ((to_image(p[0], 0), to_image(p[1], 1)), [tuple(to_image(v, k) for k, v in enumerate(seg)) for seg in segs])
+        for p, segs in paths
+    ]
+    return VectorPaths(width, height, paths)
+
+
+def _trace_job(backend: str, gray, turdsize: int, blacklevel: float) -> VectorPaths:
+    if backend == 'numpy':
+        return trace_bitmap(gray, turdsize, blacklevel)
+    svg = _run_potrace(_pgm_bytes(gray), 'svg', turdsize, blacklevel)
+    return _parse_potrace_svg(svg, gray.shape[1], gray.shape[0])
+
+
+def trace_image(img, turdsize: int = 2, blacklevel: float = 0.5, backend: Optional[str] = None) -> VectorPaths:
+    """Trace a PIL image on the calling thread, without the cache (for worker processes)."""
+    import numpy as np
+
+    if backend is None:
+        backend = 'potrace' if potrace_available() else 'numpy'
+    return _trace_job(backend, np.asarray(img.convert('L')), turdsize, blacklevel)
+
+
+def trace_async(img, turdsize: int = 2, blacklevel: float = 0.5, backend: Optional[str] = None) -> Future:
+    """
+    Trace a PIL image on the worker pool with potrace, or with the built-in
+    NumPy tracer when potrace is not installed (or backend="numpy").
+    Returns a Future resolving to the VectorPaths. Results are cached by a hash
+    of the pixels and the tracer settings, and a trace already running for the
+    same input is shared, so exporting one image in several formats traces it once.
+    """
+    if backend is None:
+        backend = 'potrace' if potrace_available() else 'numpy'
+    import numpy as np
+
+    # Read the pixels on the calling thread; PIL images should not be shared across threads
+    gray = np.ascontiguousarray(np.asarray(img.convert('L')))
+    digest = hashlib.blake2b(gray.tobytes(), digest_size=16)
+    digest.update(repr((gray.shape, turdsize, blacklevel, backend)).encode())
+    key = digest.hexdigest()
+    paths = _trace_cache.get(key)
+    if paths is not None:
+        done = Future()
+        done.set_result(paths)
+        return done
+    with _inflight_lock:
+        future = _inflight.get(key)
+        started = future is None
+        if started:
+            future = _potrace_pool().submit(_trace_job, backend, gray, turdsize, blacklevel)
+            _inflight[key] = future
+    # Outside the lock: a future that is already done runs the callback inline
+    if started:
+        future.add_done_callback(lambda f: _trace_finished(key, f))
+    return future
+
+
+def _trace_finished(key: str, future: Future):
+    if not future.cancelled() and future.exception() is None:
+        _trace_cache.put(key, future.result())
+    with _inflight_lock:
+        _inflight.pop(key, None)
+
+
+def vectorize_cache_info() -> dict:
+    return _trace_cache.info()
+
+
+def clear_vectorize_cache():
+    _trace_cache.clear()
+
+
+def vectorize_async(
+    img, out_fmt: str = 'svg', turdsize: int = 2, blacklevel: float = 0.5, backend: Optional[str] = None
+) -> Future:
+    """
+    Trace a PIL image (see trace_async) and serialize it.
+    Returns a Future resolving to the eps/svg/pdf/ps document as bytes.
+    """
+    out_fmt = out_fmt.lower()
+    if out_fmt not in VECTOR_FORMATS:
+        raise RuntimeError(f'Unsupported output format for potrace: {out_fmt}')
+    traced = trace_async(img, turdsize, blacklevel, backend)
+    result = Future()
+
+    def render(f):
+        try:
+            result.set_result(f.result().render(out_fmt))
+        except Exception as e:
+            result.set_exception(e)
+
+    traced.add_done_callback(render)
+    return result
+
+
+def vectorize(
+    img, out_fmt: str = 'svg', turdsize: int = 2, blacklevel: float = 0.5, backend: Optional[str] = None
+) -> bytes:
+    """Trace a PIL image and return the vector document as bytes (see vectorize_async)."""
+    return vectorize_async(img, out_fmt, turdsize, blacklevel, backend).result()
+
 
 def bmp_to_vector(
     in_path: str, 
@@ -18,34 +587,18 @@ def bmp_to_vector(
     log_fun: Optional[Callable[[str], None]] = None
 ) -> None:
     """
-    Convert BMP bitmap to vector graphics (eps/svg/pdf/ps) using potrace.exe.
-    Only supports grayscale or black-and-white BMP.
+    Convert a bitmap file to vector graphics (eps/svg/pdf/ps) using potrace.exe,
+    or the built-in tracer when potrace is missing.
+    Any format Pillow reads is accepted; it is traced as grayscale.
     out_fmt: eps/svg/pdf/ps
     """
-    out_fmt = os.path.splitext(out_path)[1].lower().lstrip('.')
-    potrace_exe = None
-    if check_tool('potrace'):
-        potrace_exe = shutil.which('potrace')
-    if not potrace_exe:
-        raise RuntimeError('potrace.exe not found in PATH; please install and configure the environment variable')
+    from PIL import Image
 
-    if out_fmt not in ['eps', 'svg', 'pdf', 'ps']:
-        raise RuntimeError(f'Unsupported output format for potrace: {out_fmt}')
-    # potrace only supports BMP input
-
-    ext = os.path.splitext(in_path)[1].lower()
-    if ext != '.bmp':
-        # Automatically convert to bmp temporary file
-        with Image.open(in_path) as im:
-            tmp_dir = tempfile.gettempdir()
-            tmp_bmp = os.path.join(tmp_dir, f'tmp_potrace_{os.getpid()}.bmp')
-            im.convert('L').save(tmp_bmp, format='BMP')
-            in_path = tmp_bmp
-    cmd = [potrace_exe, in_path, '-o', out_path, '-b', out_fmt.lower()]
-    try:
-        subprocess.run(cmd, check=True)
-    except Exception as e:
-        raise RuntimeError(f'potrace.exe failed: {e}')
+    out_fmt = os.path.splitext(out_path)[1].lower().lstrip('.')
+    with Image.open(in_path) as im:
+        data = vectorize(im, out_fmt)
+    with open(out_path, 'wb') as f:
+        f.write(data)
 
 
 def check_tool(tool_key: str) -> bool:
@@ -75,7 +628,7 @@ def check_tool(tool_key: str) -> bool:
         if tool["type"] == "exe" and tool["executables"]:
             exe_path = None
             for exe_name in tool["executables"]:
-                exe_path = shutil.which(exe_name)
+                exe_path = find_executable(exe_name)
                 if exe_path:
                     break
             if not exe_path:
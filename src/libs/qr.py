@@ -1,31 +1,160 @@
-from PIL import Image
-from typing import Optional
-import qrcode
+import os
+from typing import TYPE_CHECKING, Optional
+
+from src.libs.lru import LRUCache
+
+if TYPE_CHECKING:
+    import numpy as np
+    from PIL import Image
 
 """QR code utilities (refactored from generate_qr.py).
 
 Provides a simple API to generate QR images, optionally embedding a rectangular logo.
+The module matrix is rasterized directly with NumPy: every module becomes an
+integer number of pixels and the leftover goes to the quiet zone, so edges stay
+sharp at any output size. Rendered codes and scaled logos are kept in small LRU
+caches, so regenerating the same code (e.g. the server URL on every start) is
+almost free. Pillow, NumPy and qrcode are imported on first use, so importing
+this module at startup stays cheap.
 """
 
+QR_CACHE_SIZE = 32
+LOGO_CACHE_SIZE = 8
+MATRIX_CACHE_SIZE = 64
+# Quiet zone in modules, as required by the QR specification
+QR_BORDER = 4
 
-def generate_qr_image(url: str, qr_size: int = 600, logo_path: Optional[str] = None,
-                                max_logo_ratio: float = 0.4) -> Image.Image:
-    """Generate a QR code image from `url`. Optionally embed a rectangular logo.
 
-    If `output_path` is provided the image will be saved to that path. The PIL Image is returned in all cases.
+_qr_cache = LRUCache(QR_CACHE_SIZE)
+_logo_cache = LRUCache(LOGO_CACHE_SIZE)
+_matrix_cache = LRUCache(MATRIX_CACHE_SIZE)
+
+
+def _file_key(path: str):
+    """Identify a file version by path, mtime and size, so edits invalidate cached entries."""
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+def _scaled_logo(logo_path: str, box: float) -> "Image.Image":
+    """The logo decoded and scaled to fit a `box` x `box` square, cached."""
+    key = _file_key(logo_path) + (box,)
+    logo = _logo_cache.get(key)
+    if logo is None:
+        from PIL import Image
+
+        with Image.open(logo_path) as im:
+            logo = im.convert("RGBA")
+        logo_w, logo_h = logo.size
+        scale_factor = min(box / logo_w, box / logo_h)
+        new_logo_size = (max(1, int(logo_w * scale_factor)), max(1, int(logo_h * scale_factor)))
+        logo = logo.resize(new_logo_size, Image.Resampling.LANCZOS)
+        _logo_cache.put(key, logo)
+    return logo
+
+
+def qr_cache_info() -> dict:
+    """Hit/miss statistics of the QR, logo and module matrix caches."""
+    return {"qr": _qr_cache.info(), "logo": _logo_cache.info(), "matrix": _matrix_cache.info()}
+
+
+def clear_qr_cache():
+    _qr_cache.clear()
+    _logo_cache.clear()
+    _matrix_cache.clear()
+
+
+def qr_matrix(url: str, error_correction: str = "H", border: int = QR_BORDER) -> "np.ndarray":
+    """
+    Module matrix of the QR code for `url`, quiet zone included; True is a dark module.
+    Encoding dominates the cost of a code, so matrices are cached (read-only) and
+    shared by the raster and vector renderers.
     """
-    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_H)
+    key = (url, error_correction.upper(), border)
+    matrix = _matrix_cache.get(key)
+    if matrix is None:
+        matrix = _encode_qr(url, error_correction, border)
+        matrix.flags.writeable = False
+        _matrix_cache.put(key, matrix)
+    return matrix
+
+
+def _encode_qr(url: str, error_correction: str, border: int) -> "np.ndarray":
+    # qrcode and numpy are only needed once a code is generated; keep them off the startup path
+    import numpy as np
+    import qrcode
+
+    levels = {
+        "L": qrcode.constants.ERROR_CORRECT_L,
+        "M": qrcode.constants.ERROR_CORRECT_M,
+        "Q": qrcode.constants.ERROR_CORRECT_Q,
+        "H": qrcode.constants.ERROR_CORRECT_H,
+    }
+    qr = qrcode.QRCode(error_correction=levels[error_correction.upper()], border=border)
     qr.add_data(url)
     qr.make(fit=True)
-    qr_img = qr.make_image(fill_color="black", back_color="white").convert('RGB')
-    qr_img = qr_img.resize((qr_size, qr_size), Image.Resampling.LANCZOS)
+    return np.asarray(qr.get_matrix(), dtype=bool)
+
+
+def rasterize_matrix(matrix: "np.ndarray", size: int, mode: str = "L") -> "Image.Image":
+    """
+    Render a module matrix as a `size` x `size` image in mode "L" or "1".
+    Modules are scaled by a whole number of pixels and centered; the remainder
+    widens the (white) quiet zone. Matrices larger than `size` are rendered at
+    one pixel per module and scaled down with nearest neighbour.
+    """
+    import numpy as np
+    from PIL import Image
+
+    n = matrix.shape[0]
+    scale = max(1, size // n)
+    side = max(size, n)
+    light = np.ones((side, side), dtype=bool)
+    offset = (side - n * scale) // 2
+    # Each module expands to a scale x scale block without building intermediate copies
+    blocks = np.broadcast_to(~matrix[:, None, :, None], (n, scale, n, scale))
+    light[offset:offset + n * scale, offset:offset + n * scale] = blocks.reshape(n * scale, n * scale)
+    if mode == "1":
+        img = Image.frombytes("1", (side, side), np.packbits(light, axis=1).tobytes())
+    elif mode == "L":
+        img = Image.fromarray(light.astype(np.uint8) * 255, "L")
+    else:
+        raise ValueError(f"Unsupported QR image mode: {mode}")
+    if side != size:
+        img = img.resize((size, size), Image.Resampling.NEAREST)
+    return img
+
+
+def generate_qr_image(url: str, qr_size: int = 600, logo_path: Optional[str] = None,
+                                max_logo_ratio: float = 0.4, error_correction: str = "H",
+                                mode: str = "L") -> "Image.Image":
+    """Generate a QR code image from `url`. Optionally embed a rectangular logo.
+
+    `error_correction` is the ECC level: "L", "M", "Q" or "H".
+    `mode` is "L" (grayscale) or "1" (1-bit); with a logo the image is RGB.
+    Results are cached; the caller gets its own copy of the image.
+    """
+    key = (
+        url,
+        qr_size,
+        _file_key(logo_path) if logo_path else None,
+        max_logo_ratio if logo_path else None,
+        error_correction,
+        mode,
+    )
+    qr_img = _qr_cache.get(key)
+    if qr_img is None:
+        qr_img = _render_qr(url, qr_size, logo_path, max_logo_ratio, error_correction, mode)
+        _qr_cache.put(key, qr_img)
+    return qr_img.copy()
+
+
+def _render_qr(url, qr_size, logo_path, max_logo_ratio, error_correction, mode) -> "Image.Image":
+    qr_img = rasterize_matrix(qr_matrix(url, error_correction), qr_size, mode)
 
     if logo_path:
-        logo = Image.open(logo_path).convert("RGBA")
-        logo_w, logo_h = logo.size
-        scale_factor = min((qr_size * max_logo_ratio) / logo_w, (qr_size * max_logo_ratio) / logo_h)
-        new_logo_size = (max(1, int(logo_w * scale_factor)), max(1, int(logo_h * scale_factor)))
-        logo = logo.resize(new_logo_size, Image.Resampling.LANCZOS)
+        qr_img = qr_img.convert("RGB")
+        logo = _scaled_logo(logo_path, qr_size * max_logo_ratio)
         pos = ((qr_img.size[0] - logo.size[0]) // 2, (qr_img.size[1] - logo.size[1]) // 2)
         qr_img.paste(logo, pos, mask=logo)
 
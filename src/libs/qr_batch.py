@@ -0,0 +1,248 @@
+"""Batch QR code generation.
+
+Reads the contents from a CSV file (a "content" column, or the first column,
+and an optional "name" column) or a plain text file with one content per line,
+renders the codes in a process pool and writes PNG and/or vector files to a
+directory, or all of them into one ZIP archive written as results arrive.
+Each worker decodes the logo once and reuses it for every code.
+
+    python -m src.libs.qr_batch codes.csv -o out --format png,svg
+    python -m src.libs.qr_batch codes.txt --zip codes.zip --logo logo.png
+"""
+import argparse
+import csv
+import io
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, List, Optional, Sequence
+
+from src.libs.qr_vector import VECTOR_FORMATS
+
+BATCH_FORMATS = ("png",) + VECTOR_FORMATS
+MAX_NAME_LENGTH = 80
+
+
+class QRBatchItem:
+    def __init__(self, index: int, content: str, name: str = ""):
+        self.index = index
+        self.content = content
+        self.name = name
+
+
+class QRBatchReport:
+    def __init__(self):
+        self.total = 0
+        self.succeeded = 0
+        self.errors = []  # (item index, item name, message)
+        self.elapsed = 0.0
+
+    @property
+    def throughput(self) -> float:
+        return self.succeeded / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        text = (
+            f"Generated {self.succeeded}/{self.total} QR codes in {self.elapsed:.2f} s "
+            f"({self.throughput:.0f} codes/s)"
+        )
+        if self.errors:
+            text += f", {len(self.errors)} failed"
+        return text
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", name).strip("._")[:MAX_NAME_LENGTH]
+
+
+def read_items(path: str, warn: Optional[Callable[[str], None]] = None) -> List[QRBatchItem]:
+    """
+    Contents to encode, from a .csv file or a text file with one content per line.
+    CSV rows without content are skipped and reported through `warn`.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if os.path.splitext(path)[1].lower() == ".csv":
+            reader = csv.reader(f)
+            rows = [(reader.line_num, row) for row in reader if any(cell.strip() for cell in row)]
+            header = [cell.strip().lower() for cell in rows[0][1]] if rows else []
+            content_col, name_col = 0, None
+            if "content" in header:
+                content_col = header.index("content")
+                name_col = header.index("name") if "name" in header else None
+                rows = rows[1:]
+            entries = []
+            for line, row in rows:
+                content = row[content_col] if content_col < len(row) else ""
+                if not content.strip():
+                    if warn:
+                        warn(f"{path}:{line}: no content, row skipped")
+                    continue
+                name = row[name_col] if name_col is not None and name_col < len(row) else ""
+                entries.append((content, name))
+        else:
+            entries = [(line.rstrip("\r\n"), "") for line in f if line.strip()]
+    # Unique, filesystem-safe names (compared case-insensitively for Windows and
+    # ZIP extraction); numbered when missing or taken. Explicit names are
+    # reserved up front, so a generated or suffixed name never takes one that
+    # a later row asks for.
+    names = [_safe_name(name) for _, name in entries]
+    reserved = {name.lower() for name in names if name}
+    used = set()
+    items = []
+    for index, ((content, _), name) in enumerate(zip(entries, names)):
+        base = name or f"qr_{index + 1:05d}"
+        name, n = base, 1
+        while name.lower() in used or (name != names[index] and name.lower() in reserved):
+            n += 1
+            name = f"{base}_{n}"
+        used.add(name.lower())
+        items.append(QRBatchItem(index, content, name))
+    return items
+
+
+def _init_worker(options: dict):
+    # Decode and scale the logo once; later codes hit the per-process caches
+    if options.get("logo_path"):
+        from src.libs.qr import _scaled_logo
+        from src.libs.qr_vector import _load_logo
+
+        _scaled_logo(options["logo_path"], options["qr_size"] * options["max_logo_ratio"])
+        _load_logo(options["logo_path"])
+
+
+def _render_item(item: QRBatchItem, formats: Sequence[str], options: dict):
+    """Runs in a worker: returns (item, [(file name, data)], error message)."""
+    from src.libs.qr import generate_qr_image
+    from src.libs.qr_vector import render_qr_vector
+
+    files = []
+    try:
+        for fmt in formats:
+            if fmt == "png":
+                # 1-bit PNGs are the smallest and quickest to encode; a logo needs RGB
+                img = generate_qr_image(item.content, mode="1", **options)
+                buf = io.BytesIO()
+                img.save(buf, format="PNG")
+                data = buf.getvalue()
+            else:
+                data = render_qr_vector(item.content, fmt, **options)
+            files.append((f"{item.name}.{fmt}", data))
+    except Exception as e:
+        return item, [], str(e)
+    return item, files, ""
+
+
+def generate_batch(
+    items: Iterable[QRBatchItem],
+    out_dir: Optional[str] = None,
+    zip_path: Optional[str] = None,
+    formats: Sequence[str] = ("png",),
+    qr_size: int = 600,
+    logo_path: Optional[str] = None,
+    max_logo_ratio: float = 0.4,
+    error_correction: str = "H",
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> QRBatchReport:
+    """
+    Render every item in `formats` with a process pool and write the files to
+    `out_dir`, or into the ZIP archive `zip_path` ("-" for stdout).
+    Failed items are recorded in the report; the rest of the batch continues.
+    """
+    if not out_dir and not zip_path:
+        raise RuntimeError("Either an output directory or a ZIP path is required")
+    if out_dir and zip_path:
+        raise RuntimeError("An output directory and a ZIP archive cannot be used together")
+    formats = [f.lower().lstrip(".") for f in formats]
+    unknown = [f for f in formats if f not in BATCH_FORMATS]
+    if unknown:
+        raise RuntimeError(f"Unsupported QR output format: {', '.join(unknown)}")
+    items = list(items)
+    options = dict(
+        qr_size=qr_size, logo_path=logo_path, max_logo_ratio=max_logo_ratio, error_correction=error_correction
+    )
+    if logo_path and not os.path.isfile(logo_path):
+        raise RuntimeError(f"Logo not found: {logo_path}")
+
+    report = QRBatchReport()
+    report.total = len(items)
+    start = time.perf_counter()
+    archive = None
+    if zip_path:
+        target = sys.stdout.buffer if zip_path == "-" else zip_path
+        archive = zipfile.ZipFile(target, "w")
+    else:
+        os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, min(64, len(items) // (workers * 4)))
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(options,)) as pool:
+            results = pool.map(
+                _render_item, items, [formats] * len(items), [options] * len(items), chunksize=chunksize
+            )
+            for done, (item, files, error) in enumerate(results, 1):
+                if error:
+                    report.errors.append((item.index, item.name, error))
+                else:
+                    for name, data in files:
+                        if archive is not None:
+                            compress = zipfile.ZIP_STORED if name.endswith((".png", ".pdf")) else zipfile.ZIP_DEFLATED
+                            archive.writestr(name, data, compress_type=compress)
+                        else:
+                            with open(os.path.join(out_dir, name), "wb") as f:
+                                f.write(data)
+                    report.succeeded += 1
+                if progress:
+                    progress(done, report.total)
+    finally:
+        if archive is not None:
+            archive.close()
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.libs.qr_batch", description="Generate QR codes in bulk"
+    )
+    parser.add_argument("input", help="CSV file (content[,name] columns) or text file with one content per line")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("-o", "--out-dir", help="directory for the generated files")
+    target.add_argument("--zip", dest="zip_path", help="write everything into this ZIP archive ('-' for stdout)")
+    parser.add_argument("--format", default="png", help=f"comma separated: {', '.join(BATCH_FORMATS)} (default png)")
+    parser.add_argument("--size", type=int, default=600, help="image size in pixels/points (default 600)")
+    parser.add_argument("--logo", help="logo image embedded at the center")
+    parser.add_argument("--logo-ratio", type=float, default=0.4, help="maximum logo size relative to the code")
+    parser.add_argument("--ecc", default="H", choices=["L", "M", "Q", "H"], help="error correction level")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    def warn(msg):
+        print(f"Warning: {msg}", file=sys.stderr)
+
+    try:
+        report = generate_batch(
+            read_items(args.input, warn),
+            out_dir=args.out_dir,
+            zip_path=args.zip_path,
+            formats=[f.strip() for f in args.format.split(",") if f.strip()],
+            qr_size=args.size,
+            logo_path=args.logo,
+            max_logo_ratio=args.logo_ratio,
+            error_correction=args.ecc,
+            workers=args.workers,
+        )
+    except (OSError, RuntimeError, ValueError, csv.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    for index, name, error in report.errors:
+        print(f"#{index + 1} {name}: {error}", file=sys.stderr)
+    print(report.summary(), file=sys.stderr)
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,32 @@
 
 from tkinter import filedialog
-import tempfile
 import os
 from src.libs import converter
 from PIL import Image
 
+VECTOR_FILETYPES = [
+    ("SVG files", "*.svg"),
+    ("PDF files", "*.pdf"),
+    ("EPS files", "*.eps"),
+    ("PS files", "*.ps"),
+    ("All supported", "*.svg;*.pdf;*.eps;*.ps")
+]
+
+
+def ask_vector_path():
+    """Popup a save dialog for a vector file; returns (filepath, ext), filepath empty if cancelled."""
+    filepath = filedialog.asksaveasfilename(
+        defaultextension=".svg",
+        filetypes=VECTOR_FILETYPES
+    )
+    ext = ''
+    if filepath:
+        ext = os.path.splitext(filepath)[1].lower().lstrip('.')
+        if ext not in ("svg", "pdf", "eps", "ps"):
+            ext = 'svg'
+    return filepath, ext
+
+
 def save_image_as_vector(img: Image.Image, transparent: bool = False):
     """
     Save PIL image as vector format file (SVG/PDF/EPS/PS), auto popup save dialog.
@@ -13,32 +35,15 @@ def save_image_as_vector(img: Image.Image, transparent: bool = False):
     log_func: optional log function
     """
 
-    tmp_dir = tempfile.gettempdir()
-    tmp_bmp = os.path.join(tmp_dir, f'tmp_sig_{os.getpid()}.bmp')
     if not transparent:
         img = img.convert("RGB")  # Discard alpha, background becomes white
-    img.convert('L').save(tmp_bmp, format='BMP')
-    filetypes = [
-        ("SVG files", "*.svg"),
-        ("PDF files", "*.pdf"),
-        ("EPS files", "*.eps"),
-        ("PS files", "*.ps"),
-        ("All supported", "*.svg;*.pdf;*.eps;*.ps")
-    ]
-    filepath = filedialog.asksaveasfilename(
-        defaultextension=".svg",
-        filetypes=filetypes
-    )
+    # Start tracing while the dialog is open; the format is chosen afterwards
+    converter.trace_async(img)
+    filepath, ext = ask_vector_path()
     if filepath:
-        ext = os.path.splitext(filepath)[1].lower().lstrip('.')
-        if ext not in ("svg", "pdf", "eps", "ps"):
-            ext = 'svg'
-        converter.bmp_to_vector(tmp_bmp, filepath)
-    try:
-        os.remove(tmp_bmp)
-    except Exception:
-        pass
-
+        data = converter.vectorize(img, ext)
+        with open(filepath, 'wb') as f:
+            f.write(data)
     return filepath, ext
 
 
@@ -0,0 +1,211 @@
+"""Batch image-to-vector conversion.
+
+Traces every image of a directory or glob pattern in a process pool (one
+worker per CPU by default) with potrace, or the built-in tracer when potrace
+is missing, and writes one vector file per input or a single multi-page PDF.
+
+    python -m src.libs.vector_batch scans/ -o vectors --format svg
+    python -m src.libs.vector_batch "scans/*.png" --combine signed.pdf --threshold 0.6
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Iterable, List, Optional
+
+from src.libs.converter import VECTOR_FORMATS
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".gif", ".webp", ".pgm", ".pbm", ".ppm"}
+
+
+class VectorBatchReport:
+    def __init__(self):
+        self.total = 0
+        self.succeeded = 0
+        self.pixels = 0
+        self.timings = []  # (input path, seconds)
+        self.errors = []  # (input path, message)
+        self.elapsed = 0.0
+
+    @property
+    def throughput(self) -> float:
+        return self.succeeded / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        mpix = self.pixels / 1e6 / self.elapsed if self.elapsed > 0 else 0.0
+        text = (
+            f"Converted {self.succeeded}/{self.total} images in {self.elapsed:.2f} s "
+            f"({self.throughput:.1f} images/s, {mpix:.1f} Mpixel/s)"
+        )
+        if self.errors:
+            text += f", {len(self.errors)} failed"
+        return text
+
+
+def collect_inputs(patterns: Iterable[str]) -> List[str]:
+    """Image files from directories (not recursive), glob patterns or plain paths, in order."""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(
+                os.path.join(pattern, name)
+                for name in os.listdir(pattern)
+                if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+            )
+        else:
+            matches = sorted(glob.glob(pattern)) or ([pattern] if os.path.exists(pattern) else [])
+        for path in matches:
+            if os.path.isfile(path) and path not in paths:
+                paths.append(path)
+    return paths
+
+
+def _output_names(paths: List[str], fmt: str) -> List[str]:
+    names, used = [], set()
+    for path in paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        name, n = f"{stem}.{fmt}", 1
+        while name in used:
+            n += 1
+            name = f"{stem}_{n}.{fmt}"
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def _convert_one(path: str, out_path: Optional[str], fmt: str, turdsize: int, blacklevel: float, backend):
+    """
+    Runs in a worker: traces `path` and writes `out_path`, or returns the
+    geometry when `out_path` is None (combined PDF).
+    Returns (path, pixels, seconds, geometry or None, error message).
+    """
+    from PIL import Image
+
+    from src.libs import converter
+
+    start = time.perf_counter()
+    try:
+        with Image.open(path) as im:
+            pixels = im.width * im.height
+            paths = converter.trace_image(im, turdsize, blacklevel, backend)
+        if out_path is None:
+            return path, pixels, time.perf_counter() - start, paths, ""
+        data = paths.render(fmt)
+        with open(out_path, "wb") as f:
+            f.write(data)
+    except Exception as e:
+        return path, 0, time.perf_counter() - start, None, str(e)
+    return path, pixels, time.perf_counter() - start, None, ""
+
+
+def convert_batch(
+    inputs: List[str],
+    out_dir: Optional[str] = None,
+    combine: Optional[str] = None,
+    fmt: str = "svg",
+    turdsize: int = 2,
+    blacklevel: float = 0.5,
+    backend: Optional[str] = None,
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[str, float, str], None]] = None,
+) -> VectorBatchReport:
+    """
+    Trace `inputs` with a process pool. Each result is written to `out_dir`
+    as <name>.<fmt>, or all of them become the pages of the PDF `combine`;
+    exactly one of the two must be given.
+    `progress(path, seconds, error)` is called as each file finishes.
+    """
+    fmt = fmt.lower()
+    if fmt not in VECTOR_FORMATS:
+        raise RuntimeError(f"Unsupported vector format: {fmt}")
+    if not out_dir and not combine:
+        raise RuntimeError("Either an output directory or a combined PDF path is required")
+    if out_dir and combine:
+        raise RuntimeError("An output directory and a combined PDF cannot be used together")
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+        out_paths = [os.path.join(out_dir, name) for name in _output_names(inputs, fmt)]
+    else:
+        out_paths = [None] * len(inputs)
+
+    report = VectorBatchReport()
+    report.total = len(inputs)
+    pages = {}  # input index -> VectorPaths, for the combined PDF
+    start = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_convert_one, path, out_path, fmt, turdsize, blacklevel, backend): index
+            for index, (path, out_path) in enumerate(zip(inputs, out_paths))
+        }
+        # Reported as each file finishes, not in input order
+        for future in as_completed(futures):
+            path, pixels, seconds, paths, error = future.result()
+            if error:
+                report.errors.append((path, error))
+            else:
+                report.succeeded += 1
+                report.pixels += pixels
+                report.timings.append((path, seconds))
+                if paths is not None:
+                    pages[futures[future]] = paths
+            if progress:
+                progress(path, seconds, error)
+    if combine and pages:
+        from src.libs.converter import paths_to_pdf
+
+        # Pages keep the order of the inputs
+        paths_to_pdf([pages[index] for index in sorted(pages)], combine)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.libs.vector_batch", description="Convert images to vector graphics in bulk"
+    )
+    parser.add_argument("inputs", nargs="+", help="image files, directories or glob patterns")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("-o", "--out-dir", help="directory for one vector file per input")
+    target.add_argument("--combine", help="write all inputs as the pages of this PDF instead")
+    parser.add_argument("--format", default="svg", choices=list(VECTOR_FORMATS), help="output format (default svg)")
+    parser.add_argument("--threshold", type=float, default=0.5, help="ink threshold, 0-1 of white (default 0.5)")
+    parser.add_argument("--turdsize", type=int, default=2, help="drop speckles up to this many pixels (default 2)")
+    parser.add_argument("--backend", choices=["potrace", "numpy"], help="tracer (default: potrace when installed)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    inputs = collect_inputs(args.inputs)
+    if not inputs:
+        print("Error: no input images found", file=sys.stderr)
+        return 2
+
+    def progress(path, seconds, error):
+        if error:
+            print(f"{path}: failed: {error}", file=sys.stderr)
+        else:
+            print(f"{path}: {seconds * 1000:.0f} ms", file=sys.stderr)
+
+    try:
+        report = convert_batch(
+            inputs,
+            out_dir=args.out_dir,
+            combine=args.combine,
+            fmt=args.format,
+            turdsize=args.turdsize,
+            blacklevel=args.threshold,
+            backend=args.backend,
+            workers=args.workers,
+            progress=progress,
+        )
+    except (OSError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    print(report.summary(), file=sys.stderr)
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,5 @@
+import os
+
 from src.frames.base_frame import BaseFrame
 
 
@@ -20,3 +22,13 @@ class BaseTab(BaseFrame):
 
         self.output_dir = getattr(self.winfo_toplevel(), "output_dir", None)
         self.cache_dir = getattr(self.winfo_toplevel(), "cache_dir", None)
+        self.cache_manager = getattr(self.winfo_toplevel(), "cache_manager", None)
+
+    def mark_fetched(self, file_name):
+        """Release a cached upload once it has been fetched, so it can be evicted later."""
+        if self.cache_manager:
+            self.cache_manager.touch(os.path.basename(file_name), unpin=True)
+
+    def on_server_event(self, event):
+        """Called on the Tk thread for each upload/push event from the server."""
+        pass
@@ -3,8 +3,14 @@ from tkinter import ttk, filedialog
 from src.tabs.base_tab import BaseTab
 import os
 import logging
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from src.frames.title_frame import TitleFrame
+from src.utils.file_copy import copy_file
+
+SAVE_WORKERS = 4
 
 
 class FetchTab(BaseTab):
@@ -16,6 +22,10 @@ class FetchTab(BaseTab):
     def __init__(self, parent, *args, **kwargs):
         super().__init__(parent, *args, **kwargs)
         self.output_dir = os.path.join(self.output_dir, "share_output")
+        self._save_pool = None
+        # Worker threads report here; drained on the Tk thread
+        self._save_queue = queue.Queue()
+        self._save_state = None
         """
         self.out_dir_var = tk.StringVar(value=self.output_dir)
         if not os.path.exists(self.out_dir_var.get()):
@@ -70,12 +80,20 @@ class FetchTab(BaseTab):
             self.out_dir_var.set(sel)
     """
 
+    def on_server_event(self, event):
+        metadata = event.get("data") or {}
+        if event.get("type") == "upload" and metadata.get("type") in {"file", "files"}:
+            self.log(
+                logging.INFO,
+                f"{len(metadata.get('info', []))} file(s) received from phone. Click \"Fetch Files\" to save.",
+            )
+
     def pull_files(self):
         """Pull latest_metadata and save files"""
 
         self.log(logging.INFO, "Attempting to extract latest_metadata and save files...")
         metadata = self.server_frame._server_manager.latest_metadata
-        if not metadata or (metadata.get("type") not in {"text", "draw", "file"}):
+        if not metadata or (metadata.get("type") not in {"text", "draw", "file", "files"}):
             self.log(logging.WARNING, "No valid share metadata found.")
             return
         file_names = metadata.get("info", [])
@@ -98,17 +116,71 @@ class FetchTab(BaseTab):
                 self.log(logging.WARNING, "No output directory selected.")
                 return
             # else: continue loop, let user select again
+        jobs = []
         for file_name in file_names:
-            print(f"[pull_files] fetching: {file_name}")
-            src_file = os.path.join(self.cache_dir, file_name)
-            print(f"[pull_files] src_file: {src_file}")
+            src_file = os.path.join(self.cache_dir, os.path.basename(file_name))
             if not os.path.exists(src_file):
                 self.log(logging.ERROR, f"File not found in cache: {src_file}")
                 continue
-            dest_file = os.path.join(out_dir, os.path.basename(file_name))
+            jobs.append((file_name, src_file, os.path.join(out_dir, os.path.basename(file_name))))
+        if jobs:
+            self.save_files(jobs)
+
+    def save_files(self, jobs):
+        """Copy (file_name, src, dest) jobs on a worker pool, reporting progress on the Tk thread."""
+        if self._save_pool is None:
+            self._save_pool = ThreadPoolExecutor(SAVE_WORKERS, thread_name_prefix="fetch-save")
+        if self._save_state is None:
+            self._save_state = {"total": 0, "done": 0, "skipped": 0, "failed": 0, "bytes": 0, "start": time.monotonic()}
+            self.after(100, self._poll_save_progress)
+        self._save_state["total"] += len(jobs)
+        for job in jobs:
+            self._save_pool.submit(self._save_one, *job)
+
+    def _save_one(self, file_name, src_file, dest_file):
+        # Runs on a worker thread: only talk to the GUI through the queue
+        q = self._save_queue
+        try:
+            copied = copy_file(src_file, dest_file, progress=lambda n: q.put(("bytes", n)))
+            q.put(("saved" if copied else "skipped", file_name, dest_file))
+        except Exception as e:
+            q.put(("failed", file_name, f"Failed to save file {dest_file}: {e}"))
+
+    def _poll_save_progress(self):
+        state = self._save_state
+        finished = []
+        while True:
             try:
-                with open(src_file, "rb") as sf, open(dest_file, "wb") as df:
-                    df.write(sf.read())
-                self.log(logging.INFO, f"File saved: {dest_file}")
-            except Exception as e:
-                self.log(logging.ERROR, f"Failed to save file {dest_file}: {e}")
+                msg = self._save_queue.get_nowait()
+            except queue.Empty:
+                break
+            if msg[0] == "bytes":
+                state["bytes"] += msg[1]
+                continue
+            finished.append(msg)
+        for kind, file_name, detail in finished:
+            state["done"] += 1
+            if kind == "failed":
+                state["failed"] += 1
+                self.log(logging.ERROR, detail)
+                continue
+            self.mark_fetched(file_name)
+            if kind == "skipped":
+                state["skipped"] += 1
+                self.log(logging.INFO, f"Already up to date: {detail}")
+        elapsed = max(time.monotonic() - state["start"], 1e-6)
+        rate = state["bytes"] / elapsed / (1024 * 1024)
+        if finished:
+            self.log(
+                logging.INFO,
+                f"Saved {state['done']}/{state['total']} file(s), {state['bytes'] / (1024 * 1024):.1f} MB at {rate:.1f} MB/s",
+            )
+        if state["done"] >= state["total"]:
+            self.log(
+                logging.INFO,
+                f"Fetch finished: {state['done'] - state['failed'] - state['skipped']} saved, "
+                f"{state['skipped']} unchanged, {state['failed']} failed in {elapsed:.1f}s",
+            )
+            self._save_state = None
+            return
+        self.after(100, self._poll_save_progress)
@@ -4,7 +4,7 @@ from tkinter import ttk, filedialog
 import logging
 
 from src.libs.qr import generate_qr_image
-from src.libs.save_image import save_image_as_bitmap, save_image_as_vector
+from src.libs.save_image import save_image_as_bitmap, ask_vector_path
 from src.tabs.base_tab import BaseTab
 from src.frames.labeled_validated_entry import LabeledValidatedEntry
 from src.frames.title_frame import TitleFrame
@@ -14,6 +14,8 @@ class QRTab(BaseTab):
     def __init__(self, parent, *args, **kwargs):
         super().__init__(parent, *args, **kwargs)
         self.qr_img = None
+        # Parameters of the last generated code, used for vector export
+        self.qr_params = None
         self.output_dir = os.path.join(self.output_dir, "qr_output")
         self.build_content()
 
@@ -95,7 +97,7 @@ class QRTab(BaseTab):
         ttk.Button(
             frm_1,
             text="Save as Vector",
-            command=lambda: self.save(save_image_as_vector),
+            command=self.save_vector,
         ).pack(side="left", padx=4, pady=(12, 12))
 
     def browse_logo(self, max_size_mb=None):
@@ -131,9 +133,10 @@ class QRTab(BaseTab):
             self.logger.log(logging.WARNING, "No content, please enter QR content")
             return
         try:
-            self.qr_img = generate_qr_image(
-                content, qr_size=qr_size, logo_path=logo, max_logo_ratio=max_logo_ratio
+            self.qr_params = dict(
+                url=content, qr_size=qr_size, logo_path=logo, max_logo_ratio=max_logo_ratio
             )
+            self.qr_img = generate_qr_image(**self.qr_params)
             self.winfo_toplevel().image_preview(self.qr_img.copy())
             self.logger.info("QR code generated.")
         except Exception as e:
@@ -142,6 +145,22 @@ class QRTab(BaseTab):
     def save(self, save_callback):
         save_callback(self.qr_img)
 
+    def save_vector(self):
+        """Write the last generated code as SVG/PDF/EPS/PS from its module matrix."""
+        if not self.qr_params:
+            self.logger.log(logging.WARNING, "Generate a QR code first")
+            return
+        filepath, _ = ask_vector_path()
+        if not filepath:
+            return
+        from src.libs.qr_vector import save_qr_vector
+
+        try:
+            save_qr_vector(out_path=filepath, **self.qr_params)
+            self.logger.info(f"QR code saved: {filepath}")
+        except Exception as e:
+            self.logger.log(logging.ERROR, f"Vector export failed: {e}")
+
     def pull_str(self, s):
         """Process the string pushed from the QR code and display it in the input box."""
         self.content_var.set(s)
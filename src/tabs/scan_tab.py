@@ -45,6 +45,11 @@ class ScanTab(BaseTab):
             side="left", padx=0, pady=(0, 4)
         )
 
+    def on_server_event(self, event):
+        metadata = event.get("data") or {}
+        if event.get("type") == "upload" and metadata.get("type") == "text":
+            self.log(logging.INFO, 'Scanned text received. Click "Fetch Text" to view it.')
+
     def pull_text(self):
         """Pull latest_metadata and pop up the draw canvas."""
 
@@ -63,6 +68,7 @@ class ScanTab(BaseTab):
             return
         with open(text_file, "r", encoding="utf-8") as f:
             text = f.read()
+        self.mark_fetched(file_name)
         self.create_text(text)
 
     def create_text(self, text=None):
@@ -20,6 +20,9 @@ class ShareTab(BaseTab):
         if not os.path.exists(self.out_dir_var.get()):
             os.makedirs(self.out_dir_var.get(), exist_ok=True)
         self.build_content()
+        # Keep the server's shared-file catalog in sync with the selection
+        self._catalog_job = None
+        self.files_var.trace_add("write", lambda *_: self.on_selection_changed())
 
     def build_content(self):
         # Server configuration widget
@@ -100,3 +103,13 @@ class ShareTab(BaseTab):
 
     def get_file_list(self):
         return self.files_var.get().strip().split("\n")
+
+    def on_selection_changed(self):
+        # Debounced, so typing in the entry does not re-stat the selection per keystroke
+        if self._catalog_job is not None:
+            self.after_cancel(self._catalog_job)
+        self._catalog_job = self.after(300, self._rebuild_catalog)
+
+    def _rebuild_catalog(self):
+        self._catalog_job = None
+        self.server_frame._server_manager.update_share_selection(self.get_file_list())
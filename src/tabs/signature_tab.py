@@ -114,6 +114,11 @@ class SignatureTab(BaseTab):
 
         return f"{popup_w}x{popup_h}+{popup_x}+{popup_y}"
 
+    def on_server_event(self, event):
+        metadata = event.get("data") or {}
+        if event.get("type") == "upload" and metadata.get("type") == "draw":
+            self.log(logging.INFO, 'Drawing received. Click "Fetch Image" to open it.')
+
     def pull_draw(self):
         """Pull latest_metadata and pop up the draw canvas."""
 
@@ -137,6 +142,7 @@ class SignatureTab(BaseTab):
         except Exception as e:
             self.log(logging.ERROR, f"Failed to load draw image: {e}")
             return
+        self.mark_fetched(draw_file)
         # Set canvas size variables
         self.canvas_width_var.set(width)
         self.canvas_height_var.set(height)
@@ -0,0 +1,236 @@
+"""Size-bounded cache policy for output/cache.
+
+Files uploaded from the phone stay pinned until they have been fetched on the
+PC, or until a newer upload replaces them as the batch the PC can fetch;
+after that they are ordinary cache entries, evicted when they expire (TTL)
+or, least recently used first, when the cache exceeds its byte budget. The
+index is rebuilt from disk at startup, so a crash never leaves the cache
+unbounded, and nothing the user can still fetch is thrown away. The index
+also holds the size of every file, so keeping the budget after an upload
+costs no directory walk; only rebuild() reads the whole cache from disk.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+from src.utils.content_store import OBJECTS_DIR, STORE_LOCK
+
+INDEX_FILE = ".cache_index.json"
+# Leftovers of interrupted writes (upload parts, link swaps, index saves)
+TEMP_SUFFIXES = (".part", ".link", ".tmp")
+
+
+class CacheManager:
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_bytes: int = 2 * 1024 ** 3,
+        ttl: Optional[float] = 7 * 24 * 3600,
+        log_func: Optional[Callable[[int, str], None]] = None,
+    ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.log_func = log_func
+        self._entries = {}  # name -> {"last_used": float, "pinned": bool}
+        self._files = {}  # name -> ((st_dev, st_ino), size), not saved
+        self._links = {}  # (st_dev, st_ino) -> number of names sharing the file
+        self._lock = threading.RLock()
+        self._dirty = False
+        self.rebuild()
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.cache_dir, INDEX_FILE)
+
+    def log(self, level: int, msg: str):
+        if self.log_func:
+            self.log_func(level, msg)
+
+    def rebuild(self):
+        """Rebuild the index from the files on disk, keeping saved pins and access times."""
+        saved = {}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            pass
+        entries = {}
+        files = {}
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                path = os.path.join(self.cache_dir, name)
+                if name in (OBJECTS_DIR, INDEX_FILE) or not os.path.isfile(path):
+                    continue
+                if name.endswith(TEMP_SUFFIXES):
+                    # No upload survives a restart, these are orphans
+                    self._remove(path)
+                    continue
+                info = saved.get(name) or {}
+                entries[name] = {
+                    "last_used": info.get("last_used") or os.path.getmtime(path),
+                    "pinned": bool(info.get("pinned", False)),
+                }
+                files[name] = self._stat(name)
+        with self._lock:
+            self._entries = entries
+            self._files = {}
+            self._links = {}
+            for name, file in files.items():
+                self._track(name, file)
+            self._dirty = True
+        self._collect_objects()
+        self.enforce()
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._entries)
+            self._dirty = False
+        if not os.path.isdir(self.cache_dir):
+            return
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, self.index_path)
+
+    def add(self, names: Iterable[str], pinned: bool = True, unpin_others: bool = False):
+        """
+        Register newly uploaded files; they stay pinned until fetched. With
+        `unpin_others`, files pinned by earlier uploads become ordinary entries:
+        the PC can no longer fetch them once a newer batch replaces theirs.
+        """
+        names = list(names)
+        now = time.time()
+        # Only the new files are read from disk
+        files = {name: self._stat(name) for name in names}
+        with self._lock:
+            if unpin_others:
+                for name, entry in self._entries.items():
+                    if entry["pinned"] and name not in files:
+                        entry["pinned"] = False
+            for name, file in files.items():
+                self._entries[name] = {"last_used": now, "pinned": pinned}
+                self._track(name, file)
+            self._dirty = True
+        self.enforce()
+
+    def touch(self, name: str, unpin: bool = False):
+        """Mark a file as used (and fetched when `unpin` is set)."""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return
+            entry["last_used"] = time.time()
+            if unpin:
+                entry["pinned"] = False
+            self._dirty = True
+
+    def usage(self) -> int:
+        """Bytes used by the cached files, from the index; hard-linked files are counted once."""
+        with self._lock:
+            return sum({key: size for key, size in self._files.values()}.values())
+
+    def enforce(self):
+        """Evict expired files, then least recently used ones until within budget."""
+        with self._lock:
+            now = time.time()
+            candidates = sorted(
+                (e["last_used"], name)
+                for name, e in self._entries.items()
+                if not e["pinned"]
+            )
+            evicted = 0
+            if self.ttl is not None:
+                expired = [c for c in candidates if now - c[0] > self.ttl]
+                for _, name in expired:
+                    self._evict(name)
+                    evicted += 1
+                candidates = candidates[len(expired):]
+                if expired:
+                    self._collect_objects()
+            usage = self.usage()
+            for _, name in candidates:
+                if usage <= self.max_bytes:
+                    break
+                usage -= self._evict(name)
+                evicted += 1
+            if evicted:
+                self._collect_objects()
+            if usage > self.max_bytes:
+                self.log(
+                    logging.WARNING,
+                    f"[Cache] {usage} bytes in use exceeds the {self.max_bytes} byte budget; remaining files are not fetched yet",
+                )
+            if evicted:
+                self.log(logging.INFO, f"[Cache] Evicted {evicted} file(s), {usage} bytes in use")
+        self.save()
+
+    def clear(self):
+        """Remove every cached file, pinned or not."""
+        with self._lock:
+            for name in list(self._entries):
+                self._evict(name)
+            self._collect_objects()
+        self.save()
+
+    def _evict(self, name: str) -> int:
+        """Delete a cached file; returns the bytes freed once orphaned objects are collected."""
+        self._remove(os.path.join(self.cache_dir, name))
+        self._entries.pop(name, None)
+        self._dirty = True
+        # Data shared with another name stays; the stored object of a
+        # deduplicated upload is not a name and is collected afterwards
+        return self._untrack(name)
+
+    def _stat(self, name: str):
+        """((st_dev, st_ino), size) of a cached file, or None when it is gone."""
+        try:
+            st = os.stat(os.path.join(self.cache_dir, name))
+        except OSError:
+            return None
+        return (st.st_dev, st.st_ino), st.st_size
+
+    def _track(self, name: str, file):
+        self._untrack(name)
+        if file is not None:
+            self._files[name] = file
+            self._links[file[0]] = self._links.get(file[0], 0) + 1
+
+    def _untrack(self, name: str) -> int:
+        """Forget the size of a file; returns the bytes no other name shares."""
+        file = self._files.pop(name, None)
+        if file is None:
+            return 0
+        key, size = file
+        self._links[key] -= 1
+        if self._links[key]:
+            return 0
+        del self._links[key]
+        return size
+
+    def _collect_objects(self):
+        """Delete stored objects that no cache file links to any more."""
+        root = os.path.join(self.cache_dir, OBJECTS_DIR)
+        # An object just stored by an upload has no name until it is linked
+        with STORE_LOCK:
+            for dirpath, _, files in os.walk(root):
+                for f in files:
+                    path = os.path.join(dirpath, f)
+                    try:
+                        if os.stat(path).st_nlink <= 1:
+                            os.remove(path)
+                    except OSError:
+                        pass
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except OSError as e:
+            if os.path.exists(path):
+                self.log(logging.ERROR, f"Failed to delete {path}: {e}")
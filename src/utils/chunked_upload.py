@@ -0,0 +1,241 @@
+"""Resumable chunked uploads (init / PUT chunk / status / finalize).
+
+The phone splits each file into fixed-size chunks and sends them in parallel.
+Every chunk must carry its CRC32 (X-Chunk-CRC32 header) and is written at
+its offset into a sparse `<name>.<upload id>.part` file in the cache, which is
+moved into place on finalize; two sessions for the same file name never share
+a part file. Sessions are keyed by the client's file identity, so a re-sent
+batch after a dropped connection resumes with only the missing chunks.
+Sessions without activity for `ttl` seconds are dropped with their part file.
+"""
+import os
+import threading
+import time
+import uuid
+import zlib
+from typing import Dict, List, Optional
+
+from src.utils.content_store import hash_file
+from src.utils.upload_stream import check_upload_size
+
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+# Abandoned sessions are removed after this many seconds without a request
+SESSION_TTL = 24 * 3600
+
+
+class ChunkError(RuntimeError):
+    """A chunk request that cannot be accepted (bad offset, size or checksum)."""
+
+
+class ChunkedUpload:
+    """State of one file being uploaded in chunks."""
+
+    def __init__(self, upload_id: str, path: str, size: int, chunk_size: int, key: str):
+        self.upload_id = upload_id
+        self.path = path
+        self.tmp_path = f"{path}.{upload_id}.part"
+        self.size = size
+        self.chunk_size = chunk_size
+        self.key = key
+        self.chunk_count = max(1, -(-size // chunk_size))
+        self.received = set()
+        self.lock = threading.Lock()
+        self.last_active = time.monotonic()
+        with open(self.tmp_path, "ab") as f:
+            # Sparse file of the final size; chunks are written in place
+            f.truncate(size)
+
+    @property
+    def filename(self) -> str:
+        return os.path.basename(self.path)
+
+    def missing_ranges(self) -> List[List[int]]:
+        """Byte ranges [offset, length] that have not been received yet, merged."""
+        ranges = []
+        for i in range(self.chunk_count):
+            if i in self.received:
+                continue
+            offset = i * self.chunk_size
+            length = min(self.chunk_size, self.size - offset)
+            if ranges and ranges[-1][0] + ranges[-1][1] == offset:
+                ranges[-1][1] += length
+            else:
+                ranges.append([offset, length])
+        return ranges
+
+    def is_complete(self) -> bool:
+        return len(self.received) >= self.chunk_count
+
+    def status(self) -> dict:
+        return {
+            "upload_id": self.upload_id,
+            "filename": self.filename,
+            "size": self.size,
+            "chunk_size": self.chunk_size,
+            "missing": self.missing_ranges(),
+            "complete": self.is_complete(),
+        }
+
+    def touch(self):
+        self.last_active = time.monotonic()
+
+    def write_chunk(self, offset: int, stream, length: int, crc32: Optional[int], buffer_size=64 * 1024):
+        """Copy one chunk from `stream` to its offset, verifying length and CRC32 (required)."""
+        self.touch()
+        if crc32 is None:
+            raise ChunkError(f"Chunk at {offset} has no CRC32 checksum")
+        if offset % self.chunk_size or offset < 0 or offset >= max(self.size, 1):
+            raise ChunkError(f"Invalid chunk offset {offset}")
+        index = offset // self.chunk_size
+        expected = min(self.chunk_size, self.size - offset)
+        if length != expected:
+            raise ChunkError(f"Chunk at {offset} must be {expected} bytes, got {length}")
+        crc = 0
+        written = 0
+        with open(self.tmp_path, "r+b") as f:
+            f.seek(offset)
+            while written < length:
+                data = stream.read(min(buffer_size, length - written))
+                if not data:
+                    break
+                crc = zlib.crc32(data, crc)
+                f.write(data)
+                written += len(data)
+        if written != length:
+            raise ChunkError(f"Chunk at {offset} truncated: {written}/{length} bytes")
+        if crc != crc32:
+            raise ChunkError(f"Checksum mismatch for chunk at {offset}")
+        with self.lock:
+            self.received.add(index)
+
+    def finalize(self, store=None):
+        if not self.is_complete():
+            raise ChunkError(f"Upload of {self.filename} is incomplete")
+        if store is not None:
+            # Chunks arrive out of order, so the file is hashed once here
+            store.commit(self.tmp_path, hash_file(self.tmp_path), self.path)
+        else:
+            os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        try:
+            os.remove(self.tmp_path)
+        except OSError:
+            pass
+
+
+class ChunkedUploadStore:
+    """Thread-safe registry of chunked upload sessions."""
+
+    def __init__(self, max_size: Optional[int] = None, ttl: float = SESSION_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._uploads: Dict[str, ChunkedUpload] = {}
+        self._by_key: Dict[str, str] = {}
+        self._linked: Dict[str, float] = {}  # names linked from stored content -> time
+        self._lock = threading.Lock()
+
+    def init(self, out_dir: str, filename: str, size: int, chunk_size: int = None, key: str = None) -> ChunkedUpload:
+        """
+        Start (or resume) the upload of `filename` with `size` bytes into `out_dir`.
+        `key` identifies the client file (e.g. name/size/mtime); a second init with
+        the same key returns the existing session so only missing chunks are re-sent.
+        """
+        # Prevent path traversal
+        filename = os.path.basename(filename or "")
+        if not filename:
+            raise ChunkError("Missing file name")
+        if size < 0:
+            raise ChunkError("Invalid file size")
+        chunk_size = min(max(int(chunk_size or DEFAULT_CHUNK_SIZE), 64 * 1024), MAX_CHUNK_SIZE)
+        key = key or f"{filename}:{size}"
+        path = os.path.join(out_dir, filename)
+        self.sweep(out_dir)
+        with self._lock:
+            upload = self._uploads.get(self._by_key.get(key))
+            if upload and upload.path == path and upload.size == size and os.path.exists(upload.tmp_path):
+                upload.touch()
+                return upload
+            check_upload_size(out_dir, size, self.max_size)
+            upload = ChunkedUpload(uuid.uuid4().hex, path, size, chunk_size, key)
+            self._uploads[upload.upload_id] = upload
+            self._by_key[key] = upload.upload_id
+            return upload
+
+    def get(self, upload_id: str) -> ChunkedUpload:
+        upload = self._uploads.get(upload_id)
+        if upload is None:
+            raise KeyError(upload_id)
+        upload.touch()
+        return upload
+
+    def sweep(self, out_dir: Optional[str] = None) -> int:
+        """
+        Abort sessions idle for longer than the TTL and, with `out_dir`, delete
+        part files there that no session owns and that have not been written to
+        for as long (left over from a previous run). Returns how many were removed.
+        """
+        cutoff = time.monotonic() - self.ttl
+        with self._lock:
+            expired = [u for u in self._uploads.values() if u.last_active < cutoff]
+            owned = {u.tmp_path for u in self._uploads.values()}
+            for name, linked_at in list(self._linked.items()):
+                if linked_at < cutoff:
+                    del self._linked[name]
+        for upload in expired:
+            upload.abort()
+            self._forget(upload)
+        removed = len(expired)
+        if out_dir and os.path.isdir(out_dir):
+            wall_cutoff = time.time() - self.ttl
+            for entry in os.scandir(out_dir):
+                if not entry.name.endswith(".part") or entry.path in owned:
+                    continue
+                try:
+                    if entry.stat().st_mtime < wall_cutoff:
+                        os.remove(entry.path)
+                        removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    def add_linked(self, names: List[str]):
+        """Record names the server linked from stored content instead of receiving them."""
+        now = time.monotonic()
+        with self._lock:
+            for name in names:
+                self._linked[name] = now
+
+    def finalize(self, upload_ids: List[str], store=None, linked: List[str] = ()) -> List[str]:
+        """
+        Move every listed upload into place (through `store` if given) and
+        returns the saved names, followed by those of `linked` that were
+        recorded with add_linked(); names the server did not link are ignored.
+        """
+        uploads = [self.get(i) for i in upload_ids]
+        for upload in uploads:
+            if not upload.is_complete():
+                raise ChunkError(f"Upload of {upload.filename} is incomplete")
+        saved = []
+        for upload in uploads:
+            upload.finalize(store)
+            self._forget(upload)
+            saved.append(upload.filename)
+        with self._lock:
+            for name in linked:
+                name = os.path.basename(str(name or ""))
+                if self._linked.pop(name, None) is not None and name not in saved:
+                    saved.append(name)
+        return saved
+
+    def abort(self, upload_id: str):
+        upload = self.get(upload_id)
+        upload.abort()
+        self._forget(upload)
+
+    def _forget(self, upload: ChunkedUpload):
+        with self._lock:
+            self._uploads.pop(upload.upload_id, None)
+            if self._by_key.get(upload.key) == upload.upload_id:
+                del self._by_key[upload.key]
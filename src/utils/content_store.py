@@ -0,0 +1,92 @@
+"""Content-addressed storage for uploaded files.
+
+Each distinct upload is kept once under `<cache>/.objects/<aa>/<sha256>`, and
+the name the phone used is a hard link to that object in the cache directory.
+Identical content saved under different names shares storage, and a client
+can ask which hashes are already present to skip re-sending them.
+Stored objects without any name are garbage collected by the cache manager;
+STORE_LOCK keeps that from deleting an object between storing and linking it.
+"""
+import hashlib
+import os
+import shutil
+import threading
+from typing import Optional
+
+OBJECTS_DIR = ".objects"
+# Held while an object is stored and linked, and while orphans are collected
+STORE_LOCK = threading.Lock()
+
+
+def hash_file(path: str, buffer_size: int = 1024 * 1024) -> str:
+    """SHA-256 hex digest of a file, read with a bounded buffer."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(buffer_size)
+            if not data:
+                break
+            h.update(data)
+    return h.hexdigest()
+
+
+def is_valid_digest(digest: str) -> bool:
+    return (
+        isinstance(digest, str)
+        and len(digest) == 64
+        and all(c in "0123456789abcdef" for c in digest)
+    )
+
+
+class ContentStore:
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.root = os.path.join(cache_dir, OBJECTS_DIR)
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest)
+
+    def has(self, digest: str) -> bool:
+        return is_valid_digest(digest) and os.path.isfile(self.object_path(digest))
+
+    def _link(self, src: str, dest: str):
+        """Point `dest` at `src` (hard link, copy as fallback), replacing any old file."""
+        tmp = dest + ".link"
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        try:
+            os.link(src, tmp)
+        except OSError:
+            # Filesystem without hard links: fall back to a private copy
+            shutil.copyfile(src, tmp)
+        os.replace(tmp, dest)
+
+    def commit(self, tmp_path: str, digest: str, dest: str):
+        """
+        Move a fully written upload into the store and expose it as `dest`.
+        If the content is already stored, the new copy is dropped.
+        """
+        obj = self.object_path(digest)
+        with STORE_LOCK:
+            if os.path.isfile(obj):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(obj), exist_ok=True)
+                os.replace(tmp_path, obj)
+            self._link(obj, dest)
+
+    def link_existing(self, digest: str, filename: str) -> Optional[str]:
+        """Expose stored content under `filename` in the cache; None if not stored."""
+        # Prevent path traversal
+        filename = os.path.basename(filename or "")
+        if not filename:
+            return None
+        dest = os.path.join(self.cache_dir, filename)
+        with STORE_LOCK:
+            if not self.has(digest):
+                return None
+            self._link(self.object_path(digest), dest)
+        return filename
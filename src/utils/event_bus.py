@@ -0,0 +1,100 @@
+"""In-process event bus for upload and push notifications.
+
+Events get a monotonically increasing id (the cursor). Web clients follow them
+over Server-Sent Events or long-poll and resume from the last id they saw; the
+Tk side subscribes to a thread-safe queue and drains it from the main loop.
+"""
+import queue
+import threading
+import time
+from collections import deque
+from typing import List, Optional
+
+
+class Subscription:
+    """Queue of events for one in-process consumer (e.g. the Tk main loop)."""
+
+    def __init__(self, bus: "EventBus"):
+        self._bus = bus
+        self._queue = queue.Queue()
+
+    def _put(self, event: dict):
+        self._queue.put(event)
+
+    def poll(self) -> List[dict]:
+        """Return all pending events without blocking."""
+        events = []
+        while True:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                return events
+
+    def close(self):
+        self._bus.unsubscribe(self)
+
+
+class EventBus:
+
+    def __init__(self, history: int = 256):
+        self._events = deque(maxlen=history)
+        self._last_id = 0
+        self._generation = 0  # bumped by wake_all() to release waiting clients
+        self._cond = threading.Condition()
+        self._subscribers = []
+
+    @property
+    def cursor(self) -> int:
+        """Id of the most recent event (0 if none)."""
+        return self._last_id
+
+    def publish(self, type: str, data=None) -> int:
+        """Record an event, wake waiting clients and notify subscribers; returns its id."""
+        with self._cond:
+            self._last_id += 1
+            event = {"id": self._last_id, "type": type, "data": data, "time": time.time()}
+            self._events.append(event)
+            subscribers = list(self._subscribers)
+            self._cond.notify_all()
+        for sub in subscribers:
+            sub._put(event)
+        return event["id"]
+
+    def events_since(self, cursor: int) -> List[dict]:
+        with self._cond:
+            return [e for e in self._events if e["id"] > cursor]
+
+    def missed(self, cursor: int) -> bool:
+        """True if events after `cursor` have already been dropped from the history."""
+        with self._cond:
+            return bool(self._events) and self._events[0]["id"] > cursor + 1
+
+    def wait(self, cursor: int, timeout: Optional[float] = None) -> List[dict]:
+        """
+        Block until there are events newer than `cursor`, `timeout` expires or
+        wake_all() is called.
+        """
+        with self._cond:
+            generation = self._generation
+            self._cond.wait_for(
+                lambda: self._last_id > cursor or self._generation != generation,
+                timeout=timeout,
+            )
+            return [e for e in self._events if e["id"] > cursor]
+
+    def wake_all(self):
+        """Release every client blocked in wait() without an event (e.g. on server stop)."""
+        with self._cond:
+            self._generation += 1
+            self._cond.notify_all()
+
+    def subscribe(self) -> Subscription:
+        sub = Subscription(self)
+        with self._cond:
+            self._subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self._cond:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
@@ -0,0 +1,77 @@
+"""Fast file copies for saving cached uploads to a user folder.
+
+Data is copied in the kernel where possible: `os.copy_file_range` (a reflink
+or server-side copy on filesystems that support it), otherwise
+`shutil.copyfile`, which itself uses sendfile/fcopyfile. Nothing is read into
+Python memory. Copies go to a temporary name and are moved into place, so an
+interrupted copy never leaves a truncated destination.
+"""
+import filecmp
+import os
+import shutil
+from typing import Callable, Optional
+
+COPY_CHUNK = 64 * 1024 * 1024
+
+
+def files_identical(src: str, dest: str) -> bool:
+    """True if `dest` already holds exactly the content of `src`."""
+    try:
+        if os.path.samefile(src, dest):
+            return True
+        if os.path.getsize(src) != os.path.getsize(dest):
+            return False
+    except OSError:
+        return False
+    return filecmp.cmp(src, dest, shallow=False)
+
+
+def _copy_range(src: str, dest: str, progress: Optional[Callable[[int], None]]):
+    with open(src, "rb") as sf, open(dest, "wb") as df:
+        remaining = os.fstat(sf.fileno()).st_size
+        while remaining > 0:
+            n = os.copy_file_range(sf.fileno(), df.fileno(), min(COPY_CHUNK, remaining))
+            if n == 0:
+                break
+            remaining -= n
+            if progress:
+                progress(n)
+
+
+def copy_file(src: str, dest: str, progress: Optional[Callable[[int], None]] = None) -> bool:
+    """
+    Copy `src` to `dest`, calling `progress(nbytes)` as data is written.
+    Returns False (and copies nothing) when `dest` is already identical.
+    """
+    if os.path.exists(dest) and files_identical(src, dest):
+        return False
+    tmp = dest + ".part"
+    reported = 0
+
+    def report(n):
+        nonlocal reported
+        reported += n
+        if progress:
+            progress(n)
+
+    try:
+        copied = False
+        if hasattr(os, "copy_file_range"):
+            try:
+                _copy_range(src, tmp, report)
+                copied = True
+            except OSError:
+                # Unsupported across these filesystems; use the generic path
+                pass
+        if not copied:
+            shutil.copyfile(src, tmp)
+            report(os.path.getsize(tmp) - reported)
+        shutil.copystat(src, tmp)
+        os.replace(tmp, dest)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return True
@@ -0,0 +1,193 @@
+"""Local IPv4 address discovery without subprocesses.
+
+Addresses come from the kernel interface tables: psutil when it is
+installed, SIOCGIFADDR ioctls on Linux, and the host name resolution as a
+portable fallback (on Windows it returns the address of every adapter). The
+address with the default route is listed first. InterfaceMonitor runs the scan
+in the background, caches the result and rescans periodically, so the GUI
+never waits on it and picks up interfaces that come and go; the reachability
+probe only runs again when the set of addresses changes.
+"""
+import socket
+import struct
+import sys
+import threading
+from typing import Callable, List, Optional
+
+from src.utils.net_probe import rank_addresses
+
+LOOPBACK = "127.0.0.1"
+
+_SIOCGIFFLAGS = 0x8913
+_SIOCGIFADDR = 0x8915
+_IFF_UP = 0x1
+
+
+def _psutil_addresses() -> Optional[List[str]]:
+    try:
+        import psutil
+    except ImportError:
+        return None
+    stats = psutil.net_if_stats()
+    addrs = []
+    for name, entries in psutil.net_if_addrs().items():
+        if name in stats and not stats[name].isup:
+            continue
+        addrs += [e.address for e in entries if e.family == socket.AF_INET]
+    return addrs
+
+
+def _ioctl_addresses() -> Optional[List[str]]:
+    if not sys.platform.startswith("linux"):
+        return None
+    import fcntl
+
+    addrs = []
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        for _, name in socket.if_nameindex():
+            req = struct.pack("256s", name.encode()[:15])
+            try:
+                flags = struct.unpack("H", fcntl.ioctl(s.fileno(), _SIOCGIFFLAGS, req)[16:18])[0]
+                if not flags & _IFF_UP:
+                    continue
+                addrs.append(socket.inet_ntoa(fcntl.ioctl(s.fileno(), _SIOCGIFADDR, req)[20:24]))
+            except OSError:
+                # Interface without an IPv4 address
+                continue
+    finally:
+        s.close()
+    return addrs
+
+
+def _resolver_addresses() -> List[str]:
+    try:
+        infos = socket.getaddrinfo(socket.gethostname(), None, socket.AF_INET)
+    except OSError:
+        return []
+    return [sa[0] for _, _, _, _, sa in infos]
+
+
+def default_route_address() -> Optional[str]:
+    """
+    Source address the kernel would use for the default route. Connecting a UDP
+    socket only consults the routing table, no packet is sent; fails at once
+    when the machine has no route.
+    """
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        s.connect(("8.8.8.8", 80))
+        ip = s.getsockname()[0]
+    except OSError:
+        return None
+    finally:
+        s.close()
+    return ip if ip != "0.0.0.0" else None
+
+
+def interface_addresses() -> List[str]:
+    """Non-loopback IPv4 addresses of the interfaces that are up, in table order."""
+    for source in (_psutil_addresses, _ioctl_addresses):
+        try:
+            addrs = source()
+        except OSError:
+            addrs = None
+        if addrs is not None:
+            break
+    else:
+        addrs = _resolver_addresses()
+    result = []
+    for addr in addrs:
+        if not addr.startswith("127.") and addr not in result:
+            result.append(addr)
+    return result
+
+
+def local_ipv4_addresses(
+    interfaces: Optional[List[str]] = None, route: Optional[str] = None
+) -> List[str]:
+    """All local IPv4 addresses, default route first and loopback last."""
+    ips = list(interfaces) if interfaces is not None else interface_addresses()
+    route = route or default_route_address()
+    if route and not route.startswith("127."):
+        if route in ips:
+            ips.remove(route)
+        ips.insert(0, route)
+    ips.append(LOOPBACK)
+    return ips
+
+
+class InterfaceMonitor:
+    """
+    Keeps an up-to-date list of local addresses from a background thread.
+    With `probe`, the list is then reordered best first by a concurrent
+    reachability probe (see net_probe); the results are kept in `probes`.
+    The probe is repeated only when the addresses or the default route change.
+    `on_change(addresses)` is called from that thread whenever the list changes;
+    GUI code should hand the result over to its own thread.
+    """
+
+    def __init__(
+        self,
+        interval: float = 10.0,
+        on_change: Optional[Callable[[List[str]], None]] = None,
+        probe: bool = True,
+        probe_timeout: float = 0.3,
+    ):
+        self.interval = interval
+        self.on_change = on_change
+        self.probe = probe
+        self.probe_timeout = probe_timeout
+        self.probes = []
+        self._probed = None  # (addresses, route) the probes were made for
+        self._addresses: List[str] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def addresses(self) -> List[str]:
+        with self._lock:
+            return list(self._addresses)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="iface-monitor", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+
+    def refresh(self):
+        """Rescan now instead of waiting for the next interval."""
+        self._wake.set()
+
+    def _publish(self, addresses: List[str]):
+        with self._lock:
+            if addresses == self._addresses:
+                return
+            self._addresses = list(addresses)
+        if self.on_change:
+            self.on_change(list(addresses))
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                # The interface table is quick; publish it before the route lookup
+                ips = interface_addresses()
+                if not self._addresses:
+                    self._publish(ips + [LOOPBACK])
+                route = default_route_address()
+                addresses = local_ipv4_addresses(ips, route)
+                if self.probe:
+                    if (addresses, route) != self._probed:
+                        self.probes = rank_addresses(addresses, self.probe_timeout, route)
+                        self._probed = (addresses, route)
+                    addresses = [r.ip for r in self.probes]
+                self._publish(addresses)
+            except Exception:
+                pass
+            self._wake.wait(self.interval)
+            self._wake.clear()
@@ -0,0 +1,130 @@
+"""Concurrent reachability probe and ranking of local addresses.
+
+Every candidate is checked at once, each with a strict timeout:
+bind (the address is usable), a TCP connect to a listener on the same address
+(the stack and local firewall accept connections there, timed) and, where the
+OS allows unprivileged ICMP sockets, an echo request. Addresses are ranked by
+reachability, then by kind (default route, private LAN, VPN/virtual,
+link-local), then by measured latency.
+"""
+import ipaddress
+import os
+import socket
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+# Docker's default bridge and similar host-only networks are rarely reachable from a phone
+VIRTUAL_NETWORKS = [ipaddress.ip_network("172.17.0.0/16"), ipaddress.ip_network("100.64.0.0/10")]
+
+
+class ProbeResult:
+    def __init__(self, ip: str):
+        self.ip = ip
+        self.bind_ok = False
+        self.tcp_ms: Optional[float] = None
+        self.icmp_ms: Optional[float] = None  # None when ICMP is not allowed or failed
+        self.default_route = False
+        self.error = ""
+
+    @property
+    def reachable(self) -> bool:
+        return self.bind_ok and self.tcp_ms is not None
+
+    @property
+    def latency_ms(self) -> Optional[float]:
+        values = [v for v in (self.tcp_ms, self.icmp_ms) if v is not None]
+        return max(values) if values else None
+
+    def kind_rank(self) -> int:
+        """Lower is better: default route, private LAN, other, virtual/VPN, link-local, loopback."""
+        addr = ipaddress.ip_address(self.ip)
+        if addr.is_loopback:
+            return 5
+        if addr.is_link_local:
+            return 4
+        if any(addr in net for net in VIRTUAL_NETWORKS):
+            return 3
+        if self.default_route:
+            return 0
+        return 1 if addr.is_private else 2
+
+    def sort_key(self):
+        latency = self.latency_ms
+        # Whole milliseconds, so jitter does not reorder equivalent addresses
+        return (not self.reachable, self.kind_rank(), round(latency) if latency is not None else float("inf"))
+
+    def __repr__(self):
+        return f"ProbeResult({self.ip}, reachable={self.reachable}, tcp={self.tcp_ms}, icmp={self.icmp_ms})"
+
+
+def _probe_tcp(result: ProbeResult, timeout: float):
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        listener.bind((result.ip, 0))
+        result.bind_ok = True
+        listener.listen(1)
+        port = listener.getsockname()[1]
+        client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        client.settimeout(timeout)
+        try:
+            start = time.perf_counter()
+            client.connect((result.ip, port))
+            result.tcp_ms = (time.perf_counter() - start) * 1000
+        finally:
+            client.close()
+    except OSError as e:
+        result.error = str(e)
+    finally:
+        listener.close()
+
+
+def _icmp_checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _probe_icmp(result: ProbeResult, timeout: float):
+    # Unprivileged ICMP sockets (Linux ping_group_range, macOS); skipped elsewhere
+    try:
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+    except (OSError, AttributeError):
+        return
+    try:
+        s.settimeout(timeout)
+        s.bind((result.ip, 0))
+        ident = os.getpid() & 0xFFFF
+        header = struct.pack("!BBHHH", 8, 0, 0, ident, 1)
+        payload = b"fibridge"
+        packet = struct.pack("!BBHHH", 8, 0, _icmp_checksum(header + payload), ident, 1) + payload
+        start = time.perf_counter()
+        s.sendto(packet, (result.ip, 0))
+        s.recv(64)
+        result.icmp_ms = (time.perf_counter() - start) * 1000
+    except OSError:
+        pass
+    finally:
+        s.close()
+
+
+def probe_address(ip: str, timeout: float = 0.3, default_route: bool = False) -> ProbeResult:
+    result = ProbeResult(ip)
+    result.default_route = default_route
+    _probe_tcp(result, timeout)
+    if result.bind_ok:
+        _probe_icmp(result, timeout)
+    return result
+
+
+def rank_addresses(ips: List[str], timeout: float = 0.3, default_route: Optional[str] = None) -> List[ProbeResult]:
+    """Probe all `ips` concurrently and return the results, best first."""
+    if not ips:
+        return []
+    with ThreadPoolExecutor(max_workers=min(len(ips), 16), thread_name_prefix="ip-probe") as pool:
+        results = list(pool.map(lambda ip: probe_address(ip, timeout, ip == default_route), ips))
+    return sorted(results, key=ProbeResult.sort_key)
@@ -1,21 +1,44 @@
 import os
 import threading
-import socket
-import subprocess
-import re
 import logging
 import json
-from flask import Flask, request, jsonify, send_from_directory
-from werkzeug.serving import make_server
-from typing import Tuple
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from src.utils.upload_stream import stream_multipart_upload, UploadTooLargeError
+from src.utils.chunked_upload import ChunkedUploadStore, ChunkError
+from src.utils.share_catalog import ShareCatalog
+from src.utils.event_bus import EventBus
+from src.utils.zip_stream import ZipEntry, ZipStream
+from src.utils.content_store import ContentStore
+from src.utils.net_interfaces import local_ipv4_addresses
+from src.utils.tls import can_generate_certificate, create_server_context, ensure_certificate
 
 
 class ServerManager:
 
-    def __init__(self, host="127.0.0.1", port=5000, log_func=None):
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=5000,
+        log_func=None,
+        backend="werkzeug",
+        workers=8,
+        queue_size=64,
+        timeout=30.0,
+        max_upload_size=None,
+    ):
         self.host = host
         self.port = port
         self.log_func = log_func
+        # Serving backend: worker pool size, accept queue bound, per-connection timeout.
+        # Created on first use so werkzeug/Flask are not imported at GUI startup
+        self._backend = None
+        self._backend_spec = (
+            backend,
+            {"workers": workers, "queue_size": queue_size, "timeout": timeout},
+        )
+        self.max_upload_size = max_upload_size  # bytes per upload request, None = free disk space
         self.scheme = "http"  # http or https, decided at start()
         # Static resources now live under src/js
         # BASEDIR -> src
@@ -25,15 +48,45 @@ class ServerManager:
         self.STATIC_DIR = os.path.join(self.BASEDIR, "static")
         self.INDEX_FILE = "index.html"
         self.latest_metadata = None  # New caching mechanism, stores the metadata of the most recent upload
-        self.app = self._create_app()
+        self.latest_payload = None
+        # Set by the app: where uploads are stored, and the policy trimming it
+        self.cache_dir = None
+        self.cache_manager = None
+        # SSE streams end after this many seconds so they do not pin a worker forever
+        self.event_stream_duration = 300
+        self.events = EventBus()  # upload/push notifications for SSE, long-poll and the GUI
+        self._stopping = threading.Event()  # set while stopping; open event streams end
+        self.chunked_uploads = ChunkedUploadStore(max_size=max_upload_size)
+        self.share_catalog = ShareCatalog()  # files exposed by the ShareTab, keyed by name
+        self._app = None
         self._srv = None
         self._thread = None
+        self._lifecycle = ThreadPoolExecutor(1, thread_name_prefix="server-lifecycle")
         # SSL certificate path
         self.cert_path = os.path.join(self.BASEDIR, "cert.pem")
         self.key_path = os.path.join(self.BASEDIR, "key.pem")
+        self.auto_generate_cert = True  # create a self-signed certificate when none exists
+        self._ssl_context = None  # (files key, SSLContext)
         self.is_running = False
 
+    @property
+    def app(self):
+        """The Flask app, built on first access."""
+        if self._app is None:
+            self._app = self._create_app()
+        return self._app
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            from src.utils.serving import create_backend
+
+            name, opts = self._backend_spec
+            self._backend = create_backend(name, **opts)
+        return self._backend
+
     def _create_app(self):
+        from flask import Flask, Response, request, jsonify, send_from_directory, send_file
 
         app = Flask(__name__, static_folder=self.STATIC_DIR, static_url_path="")
         manager = self
@@ -44,46 +97,161 @@ class ServerManager:
 
         @app.route("/api/file_share/upload", methods=["POST"])
         def file_share_upload():
-            tab = getattr(self, "ShareTab_instance", None)
-            if not tab or not hasattr(tab, "cache_dir"):
+            if not manager.cache_dir:
                 return (
                     jsonify(
                         {"success": False, "error": "No output directory configured"}
                     ),
                     400,
                 )
-            out_dir = tab.cache_dir
+            out_dir = manager.cache_dir
             if not os.path.exists(out_dir):
                 os.makedirs(out_dir, exist_ok=True)
-            files = request.files.getlist("photos")
-            saved = []
-            for f in files:
-                filename = f.filename
-                # Prevent path traversal
-                filename = os.path.basename(filename)
-                save_path = os.path.join(out_dir, filename)
-                try:
-                    f.save(save_path)
-                    self.log(logging.INFO, f"[UPLOAD] File saved: {save_path}")
-                    saved.append(filename)
-                except Exception as e:
-                    self.log(logging.ERROR, f"[UPLOAD] Failed to save {save_path}: {e}")
-                    return jsonify({"success": False, "error": str(e)}), 500
+            boundary = request.mimetype_params.get("boundary")
+            if request.mimetype != "multipart/form-data" or not boundary:
+                return (
+                    jsonify({"success": False, "error": "Expected multipart/form-data"}),
+                    400,
+                )
+            # Parse the body ourselves instead of request.files, so each part is
+            # written once, straight into the cache, as it arrives
+            try:
+                file_count = int(request.headers.get("X-Upload-Files", ""))
+            except ValueError:
+                file_count = None
+            try:
+                saved = stream_multipart_upload(
+                    request.stream,
+                    boundary.encode("latin-1"),
+                    out_dir,
+                    content_length=request.content_length,
+                    max_size=manager.max_upload_size,
+                    log_func=lambda msg: self.log(logging.INFO, msg),
+                    store=ContentStore(out_dir),
+                    file_count=file_count,
+                )
+            except UploadTooLargeError as e:
+                self.log(logging.ERROR, f"[UPLOAD] Rejected: {e}")
+                return jsonify({"success": False, "error": str(e)}), 413
+            except ValueError as e:
+                # Malformed or truncated multipart body: the client's fault
+                self.log(logging.WARNING, f"[UPLOAD] Rejected malformed upload: {e}")
+                return jsonify({"success": False, "error": str(e)}), 400
+            except Exception as e:
+                self.log(logging.ERROR, f"[UPLOAD] Failed to save upload: {e}")
+                return jsonify({"success": False, "error": str(e)}), 500
             self.log(logging.INFO, f"[UPLOAD] All files saved to: {out_dir}")
 
             # Update latest metadata cache
-            if len(saved) == 1:
-                ext = os.path.splitext(saved[0])[1].lower()
-                if ext == ".txt":
-                    self.latest_metadata = {"type": "text", "info": [saved[0]]}
-                elif ext == ".png":
-                    self.latest_metadata = {"type": "draw", "info": [saved[0]]}
-                else:
-                    self.latest_metadata = {"type": "file", "info": [saved[0]]}
-            elif len(saved) > 1:
-                self.latest_metadata = {"type": "files", "info": saved}
-            else:
-                self.latest_metadata = None
+            manager.update_latest_metadata(saved)
+            return jsonify({"success": True, "files": saved})
+
+        # --- Resumable chunked upload API ---
+        @app.route("/api/file_share/chunked/init", methods=["POST"])
+        def chunked_init():
+            if not manager.cache_dir:
+                return (
+                    jsonify(
+                        {"success": False, "error": "No output directory configured"}
+                    ),
+                    400,
+                )
+            j = request.get_json(silent=True) or {}
+            os.makedirs(manager.cache_dir, exist_ok=True)
+            try:
+                upload = manager.chunked_uploads.init(
+                    manager.cache_dir,
+                    j.get("filename"),
+                    int(j.get("size", -1)),
+                    chunk_size=j.get("chunk_size"),
+                    key=j.get("key"),
+                )
+            except UploadTooLargeError as e:
+                return jsonify({"success": False, "error": str(e)}), 413
+            except (ChunkError, ValueError, TypeError) as e:
+                return jsonify({"success": False, "error": str(e)}), 400
+            return jsonify({"success": True, **upload.status()})
+
+        @app.route("/api/file_share/chunked/<upload_id>", methods=["GET"])
+        def chunked_status(upload_id):
+            try:
+                upload = manager.chunked_uploads.get(upload_id)
+            except KeyError:
+                return jsonify({"success": False, "error": "Unknown upload"}), 404
+            return jsonify({"success": True, **upload.status()})
+
+        @app.route("/api/file_share/chunked/<upload_id>", methods=["PUT"])
+        def chunked_put(upload_id):
+            try:
+                upload = manager.chunked_uploads.get(upload_id)
+            except KeyError:
+                return jsonify({"success": False, "error": "Unknown upload"}), 404
+            crc = request.headers.get("X-Chunk-CRC32")
+            try:
+                upload.write_chunk(
+                    int(request.args.get("offset", -1)),
+                    request.stream,
+                    request.content_length or 0,
+                    int(crc, 16) if crc else None,
+                )
+            except (ChunkError, ValueError) as e:
+                self.log(logging.WARNING, f"[UPLOAD] Chunk rejected for {upload.filename}: {e}")
+                return jsonify({"success": False, "error": str(e)}), 400
+            return jsonify({"success": True, "complete": upload.is_complete()})
+
+        @app.route("/api/file_share/chunked/<upload_id>", methods=["DELETE"])
+        def chunked_abort(upload_id):
+            try:
+                manager.chunked_uploads.abort(upload_id)
+            except KeyError:
+                return jsonify({"success": False, "error": "Unknown upload"}), 404
+            return jsonify({"success": True})
+
+        @app.route("/api/file_share/have", methods=["POST"])
+        def file_share_have():
+            # Pre-upload check: {"files": [{"filename", "sha256"}]}. Content the PC
+            # already holds is linked under the new name, the client skips sending it
+            if not manager.cache_dir:
+                return (
+                    jsonify(
+                        {"success": False, "error": "No output directory configured"}
+                    ),
+                    400,
+                )
+            j = request.get_json(silent=True) or {}
+            store = ContentStore(manager.cache_dir)
+            linked = []
+            for item in j.get("files") or []:
+                name = store.link_existing(
+                    str(item.get("sha256", "")).lower(), item.get("filename")
+                )
+                if name:
+                    linked.append(name)
+            if linked:
+                self.log(logging.INFO, f"[UPLOAD] {len(linked)} file(s) already cached, skipped")
+                manager.chunked_uploads.add_linked(linked)
+                if manager.cache_manager:
+                    # Tracked (and pinned) right away, even if the batch is never finalized
+                    manager.cache_manager.add(linked)
+            return jsonify({"success": True, "linked": linked})
+
+        @app.route("/api/file_share/chunked/finalize", methods=["POST"])
+        def chunked_finalize():
+            # "files" lists names linked by /api/file_share/have in the same batch;
+            # only names the server actually linked are accepted
+            j = request.get_json(silent=True) or {}
+            store = ContentStore(manager.cache_dir) if manager.cache_dir else None
+            try:
+                saved = manager.chunked_uploads.finalize(
+                    j.get("uploads") or [], store, linked=j.get("files") or []
+                )
+            except KeyError as e:
+                return jsonify({"success": False, "error": f"Unknown upload {e}"}), 404
+            except ChunkError as e:
+                return jsonify({"success": False, "error": str(e)}), 409
+            for name in saved:
+                self.log(logging.INFO, f"[UPLOAD] File saved: {name}")
+            manager.update_latest_metadata(saved)
             return jsonify({"success": True, "files": saved})
 
         @app.route("/get_pushed_signature", methods=["GET"])
@@ -110,8 +278,64 @@ class ServerManager:
                     400,
                 )
             manager.latest_payload = {"type": typ, "data": data, "filename": filename}
+            manager.events.publish("push", {"type": typ, "filename": filename})
             return jsonify({"status": "ok"})
 
+        # --- Event channel (SSE with long-poll fallback) ---
+        def _start_cursor():
+            raw = request.args.get("cursor") or request.headers.get("Last-Event-ID")
+            try:
+                cursor = int(raw) if raw else manager.events.cursor
+            except ValueError:
+                cursor = manager.events.cursor
+            # A cursor from a previous session is ahead of the bus: start over
+            reset = cursor > manager.events.cursor or manager.events.missed(cursor)
+            if cursor > manager.events.cursor:
+                cursor = manager.events.cursor
+            return cursor, reset
+
+        @app.route("/api/events", methods=["GET"])
+        def events_stream():
+            cursor, reset = _start_cursor()
+
+            def stream():
+                nonlocal cursor
+                # Browsers reconnect with Last-Event-ID after the stream ends
+                yield "retry: 3000\n\n"
+                if reset:
+                    yield f"id: {cursor}\nevent: reset\ndata: {{}}\n\n"
+                deadline = time.monotonic() + manager.event_stream_duration
+                while time.monotonic() < deadline and not manager._stopping.is_set():
+                    events = manager.events.wait(cursor, timeout=15)
+                    if not events:
+                        yield ": keep-alive\n\n"
+                        continue
+                    for e in events:
+                        cursor = e["id"]
+                        yield f"id: {e['id']}\nevent: {e['type']}\ndata: {json.dumps(e['data'])}\n\n"
+
+            return Response(
+                stream(),
+                mimetype="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+
+        @app.route("/api/events/poll", methods=["GET"])
+        def events_poll():
+            cursor, reset = _start_cursor()
+            try:
+                timeout = min(max(float(request.args.get("timeout", 25)), 0), 60)
+            except ValueError:
+                timeout = 25
+            events = manager.events.wait(cursor, timeout=timeout)
+            return jsonify(
+                {
+                    "cursor": events[-1]["id"] if events else cursor,
+                    "reset": reset,
+                    "events": events,
+                }
+            )
+
         @app.route("/")
         def index():
             return send_from_directory(manager.STATIC_DIR, manager.INDEX_FILE)
@@ -136,63 +360,108 @@ class ServerManager:
         # --- File Sharing API ---
         @app.route("/api/file_share/files", methods=["GET"])
         def file_share_list():
+            # Paginated and sortable: ?offset=0&limit=200&sort=name|ext|size|mtime&order=asc|desc
+            try:
+                offset = int(request.args.get("offset", 0))
+                limit = request.args.get("limit")
+                limit = int(limit) if limit is not None else None
+            except ValueError:
+                return jsonify({"error": "Invalid offset or limit"}), 400
+            sort = request.args.get("sort", "name")
+            descending = request.args.get("order", "asc").lower() == "desc"
             self.log(
                 logging.INFO,
-                f"[Flask] /api/file_share/files called. manager.ShareTab_instance: {repr(getattr(manager, 'ShareTab_instance', None))}",
+                f"[Flask] /api/file_share/files called. offset={offset} limit={limit} sort={sort}",
             )
-            tab = getattr(manager, "ShareTab_instance", None)
-            if tab and hasattr(tab, "get_file_list"):
-                self.log(
-                    logging.INFO,
-                    f"[Flask] Calling ShareTab_instance.get_file_list()...",
-                )
-                return (
-                    self.api_file_list(tab.get_file_list()),
-                    200,
-                    {"Content-Type": "application/json"},
-                )
-            self.log(
-                logging.WARNING,
-                f"[Flask] No valid ShareTab_instance or get_file_list not found.",
+            body, total = self.api_file_list(offset, limit, sort, descending)
+            return (
+                body,
+                200,
+                {"Content-Type": "application/json", "X-Total-Count": str(total)},
             )
-            return jsonify([])
 
         @app.route("/api/file_share/download", methods=["GET"])
         def file_share_download():
             filename = request.args.get("filename")
             self.log(
                 logging.INFO,
-                f"[Flask] /api/file_share/download called. filename: {filename} manager.ShareTab_instance: {repr(getattr(manager, 'ShareTab_instance', None))}",
+                f"[Flask] /api/file_share/download called. filename: {filename}",
             )
-            tab = getattr(manager, "ShareTab_instance", None)
-            if tab and hasattr(tab, "get_file_list"):
-                self.log(
-                    logging.INFO,
-                    f"[Flask] Calling ShareTab_instance.get_file_list({filename})...",
+            path = self.api_file_download(filename)
+            if path:
+                # conditional=True answers Range/If-Range with 206 partial content;
+                # the file is streamed in blocks (sendfile when the server offers
+                # wsgi.file_wrapper), so memory stays flat for large files
+                return send_file(
+                    path,
+                    mimetype="application/octet-stream",
+                    as_attachment=True,
+                    download_name=filename,
+                    conditional=True,
+                    etag=True,
+                    max_age=0,
                 )
-                data = self.api_file_download(tab.get_file_list(), filename)
-                if data:
-                    from flask import Response
-                    import urllib.parse
-
-                    response = Response(data, mimetype="application/octet-stream")
-                    # RFC 5987 encoding for non-ASCII filenames
-                    filename_ascii = filename.encode('ascii', 'ignore').decode() or 'download'
-                    response.headers["Content-Disposition"] = (
-                        f"attachment; filename=\"{filename_ascii}\"; filename*=UTF-8''{urllib.parse.quote(filename)}"
-                    )
-                    return response
             return jsonify({"error": "File not found"}), 404
 
+        @app.route("/api/file_share/zip", methods=["GET", "POST"])
+        def file_share_zip():
+            # Selected files as repeated "filename" query or form fields
+            names = request.values.getlist("filename")
+            self.log(
+                logging.INFO,
+                f"[Flask] /api/file_share/zip called with {len(names)} file(s)",
+            )
+            stream = self.api_file_zip(names)
+            if stream is None:
+                return jsonify({"error": "File not found"}), 404
+            headers = {
+                "Content-Disposition": f'attachment; filename="fibridge_{time.strftime("%Y%m%d_%H%M%S")}.zip"'
+            }
+            length = stream.content_length()
+            if length is not None:
+                headers["Content-Length"] = str(length)
+            return Response(iter(stream), mimetype="application/zip", headers=headers)
+
         return app
 
+    def ssl_available(self) -> bool:
+        return os.path.exists(self.cert_path) and os.path.exists(self.key_path)
+
+    def expected_scheme(self) -> str:
+        """Scheme the next start() will serve, known before the server is up."""
+        if self.ssl_available() or (self.auto_generate_cert and can_generate_certificate()):
+            return "https"
+        return "http"
+
+    def ssl_context(self):
+        """
+        The server SSLContext, generating a self-signed certificate first if
+        allowed and needed. It is reused across restarts while the certificate
+        files are unchanged, so phones can resume their TLS sessions.
+        """
+        if self.auto_generate_cert and can_generate_certificate():
+            if ensure_certificate(
+                self.cert_path, self.key_path, local_ipv4_addresses(), log_func=self.log
+            ):
+                self.log(logging.INFO, f"[ServerManager] Generated self-signed certificate: {self.cert_path}")
+        if not self.ssl_available():
+            return None
+        key = (
+            self.cert_path,
+            self.key_path,
+            os.path.getmtime(self.cert_path),
+            os.path.getmtime(self.key_path),
+        )
+        if self._ssl_context is None or self._ssl_context[0] != key:
+            self._ssl_context = (key, create_server_context(self.cert_path, self.key_path))
+        return self._ssl_context[1]
+
     def start(self):
         if self._srv is not None:
             self.log(logging.INFO, "Server already started")
             return
-        ssl_context = None
-        if os.path.exists(self.cert_path) and os.path.exists(self.key_path):
-            ssl_context = (self.cert_path, self.key_path)
+        ssl_context = self.ssl_context()
+        if ssl_context is not None:
             self.log(
                 logging.INFO,
                 f"[ServerManager] Using SSL context: {self.cert_path}, {self.key_path}",
@@ -204,154 +473,160 @@ class ServerManager:
                 "[ServerManager] SSL certificate not found, using HTTP mode. Please generate cert.pem and key.pem in the project root directory.",
             )
             self.scheme = "http"
-        self._srv = make_server(self.host, self.port, self.app, ssl_context=ssl_context)
+        try:
+            self._srv = self.backend.make_server(
+                self.host, self.port, self.app, ssl_context=ssl_context
+            )
+        except SystemExit:
+            # werkzeug exits the process when it cannot bind
+            raise RuntimeError(f"Cannot listen on {self.host}:{self.port}") from None
+        self.log(
+            logging.INFO,
+            f"[ServerManager] Serving with {self.backend.name} backend, {self.backend.workers} workers",
+        )
+        self._stopping.clear()
         self._thread = threading.Thread(target=self._srv.serve_forever, daemon=True)
         self._thread.start()
         self.is_running = True
 
+    def start_async(self, on_ready=None) -> Future:
+        """
+        Start the server on a background thread. The returned future resolves
+        once the socket is accepting connections (or holds the start error);
+        `on_ready(future)` is then called from that background thread.
+        """
+        return self._run_async(self.start, on_ready)
+
+    def stop_async(self, on_done=None) -> Future:
+        """Stop the server on a background thread; see start_async."""
+        return self._run_async(self.stop, on_done)
+
+    def _run_async(self, func, callback) -> Future:
+        def run():
+            func()
+            return self.get_base_url()
+
+        # One worker: start and stop requests are applied one at a time, in order
+        future = self._lifecycle.submit(run)
+        if callback:
+            future.add_done_callback(callback)
+        return future
+
+    def set_backend(self, name, **kwargs):
+        """Select the serving backend used by the next start() ('werkzeug', 'cheroot', 'waitress')."""
+        opts = dict(self._backend_spec[1])
+        opts.update(kwargs)
+        self._backend_spec = (name, opts)
+        self._backend = None
+
     def get_base_url(self) -> str:
         return f"{self.scheme}://{self.host}:{self.port}"
 
+    def connection_stats(self):
+        """Connection, request and TLS handshake counters of the running server (None if unavailable)."""
+        stats = getattr(self._srv, "stats", None)
+        return stats.snapshot() if stats else None
+
     def stop(self):
+        stats = self.connection_stats()
+        if stats:
+            self.log(
+                logging.INFO,
+                f"[ServerManager] {stats['requests']} requests over {stats['connections']} connections, "
+                f"{stats['handshakes']} TLS handshakes ({stats['resumed_handshakes']} resumed)",
+            )
+        # End open event streams and long-polls so their workers are free to exit
+        self._stopping.set()
+        self.events.wake_all()
         try:
             if self._srv:
                 self._srv.shutdown()
+                if self._thread:
+                    self._thread.join(timeout=5)
+                # Release the listening socket so the port can be reused at once
+                self._srv.server_close()
         except Exception:
             pass
         self._srv = None
         self._thread = None
         self.is_running = False
+        # Drop idle chunked upload sessions and their part files
+        self.chunked_uploads.sweep(self.cache_dir)
 
     def list_local_ips(self):
-        ips = []
-        try:
-            name = socket.gethostname()
-            for res in socket.getaddrinfo(name, None):
-                af, _, _, _, sa = res
-                if af == socket.AF_INET:
-                    addr = sa[0]
-                    if not addr.startswith("127.") and addr not in ips:
-                        ips.append(addr)
-        except Exception:
-            pass
-        try:
-            probe = self._get_local_ip()
-            if probe and probe not in ips:
-                ips.insert(0, probe)
-        except Exception:
-            pass
-        try:
-            if os.name == "nt":
-                p = subprocess.run(["ipconfig"], capture_output=True, text=True)
-                out = p.stdout or p.stderr or ""
-                for m in re.finditer(r"IPv4[^\n:]*:\s*([0-9]+(?:\.[0-9]+){3})", out):
-                    a = m.group(1)
-                    if not a.startswith("127.") and a not in ips:
-                        ips.append(a)
-        except Exception:
-            pass
-        if "127.0.0.1" not in ips:
-            ips.append("127.0.0.1")
-        return ips
-
-    def _get_local_ip(self) -> str:
-
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        try:
-            s.connect(("8.8.8.8", 80))
-            ip = s.getsockname()[0]
-        except Exception:
-            ip = "127.0.0.1"
-        finally:
-            try:
-                s.close()
-            except Exception:
-                pass
-        return ip
+        """Local IPv4 addresses, read from the interface tables (see net_interfaces)."""
+        return local_ipv4_addresses()
 
     # File saving logic has been removed, signatures are only stored in memory cache
 
-    def test_bind(self, ip: str, port: int) -> Tuple[bool, str]:
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        try:
-            s.bind((ip, port))
-            return True, "Local bind OK"
-        except Exception as e:
-            return False, f"Local bind FAILED: {e}"
-        finally:
-            try:
-                s.close()
-            except Exception:
-                pass
-
-    def ping_host(self, ip: str, count: int = 1) -> Tuple[bool, str]:
-        try:
-            if os.name == "nt":
-                cmd = ["ping", "-n", str(count), ip]
-            else:
-                cmd = ["ping", "-c", str(count), ip]
-            p = subprocess.run(cmd, capture_output=True, text=True)
-            out = p.stdout or p.stderr or ""
-            if "TTL=" in out or "ttl=" in out:
-                return True, out
-            else:
-                return False, out
-        except Exception as e:
-            return False, str(e)
-
     def log(self, level: int, msg: str):
         if self.log_func:
             self.log_func(level, msg)
 
-    def get_selected_files_info(self, file_list):
+    def update_latest_metadata(self, saved):
+        """Record the files of the most recent upload for the Fetch buttons."""
+        if len(saved) == 1:
+            ext = os.path.splitext(saved[0])[1].lower()
+            if ext == ".txt":
+                self.latest_metadata = {"type": "text", "info": [saved[0]]}
+            elif ext == ".png":
+                self.latest_metadata = {"type": "draw", "info": [saved[0]]}
+            else:
+                self.latest_metadata = {"type": "file", "info": [saved[0]]}
+        elif len(saved) > 1:
+            self.latest_metadata = {"type": "files", "info": saved}
+        else:
+            self.latest_metadata = None
+        if self.latest_metadata:
+            if self.cache_manager:
+                # Pinned until fetched or replaced by a newer batch, then
+                # subject to LRU/TTL eviction
+                self.cache_manager.add(saved, unpin_others=True)
+            self.events.publish("upload", self.latest_metadata)
+
+    def update_share_selection(self, file_list):
+        """Rebuild the shared-file catalog; called whenever the ShareTab selection changes."""
+        self.share_catalog.update(file_list)
+
+    def api_file_list(self, offset=0, limit=None, sort="name", descending=False):
         """
-        Get information about the user-selected files (base name, ext, size, mtime) for web display.
+        Used for server API, returns one page of brief information about the shared
+        files (excluding full paths) as JSON, and the total number of shared files.
         """
-        result = []
-        for f in file_list:
-            f = f.strip()
-            if f and os.path.isfile(f):
-                stat = os.stat(f)
-                base = os.path.basename(f)
-                name, ext = os.path.splitext(base)
-                result.append(
+        page, total = self.share_catalog.list(offset, limit, sort, descending)
+        # Only return safe fields
+        return (
+            json.dumps(
+                [
                     {
-                        "name": name,
-                        "ext": ext,
-                        "size": stat.st_size,
-                        "mtime": stat.st_mtime,
-                        "full": f,
+                        "name": i["name"],
+                        "ext": i["ext"],
+                        "size": i["size"],
+                        "mtime": i["mtime"],
                     }
-                )
-        return result
+                    for i in page
+                ]
+            ),
+            total,
+        )
 
-    def api_file_list(self, filelist):
+    def api_file_download(self, filename):
         """
-        Used for server API, returns brief information about the selected files (excluding full paths).
+        Used for server API, resolves the specified file (filename is base name + ext).
+        Returns the full path so the caller can stream it, or None if not shared.
         """
+        entry = self.share_catalog.get(filename) if filename else None
+        return entry["full"] if entry else None
 
-        info = self.get_selected_files_info(filelist)
-        # Only return safe fields
-        return json.dumps(
-            [
-                {
-                    "name": i["name"],
-                    "ext": i["ext"],
-                    "size": i["size"],
-                    "mtime": i["mtime"],
-                }
-                for i in info
-            ]
-        )
-
-    def api_file_download(self, filelist, filename):
+    def api_file_zip(self, filenames):
         """
-        Used for server API, downloads the specified file (filename is base name + ext).
+        Used for server API, builds a streaming ZIP of the specified shared files.
+        Returns None if the list is empty or any file is not shared.
         """
-        info = self.get_selected_files_info(filelist)
-        for i in info:
-            if i["name"] + i["ext"] == filename:
-                # The server should securely send the file here
-                with open(i["full"], "rb") as f:
-                    return f.read()
-        return None
+        entries = []
+        for filename in dict.fromkeys(filenames):
+            entry = self.share_catalog.get(filename)
+            if entry is None:
+                return None
+            entries.append(ZipEntry(filename, entry["full"], entry["size"], entry["mtime"]))
+        return ZipStream(entries) if entries else None
@@ -0,0 +1,459 @@
+"""Pluggable WSGI serving backends for ServerManager.
+
+The default backend runs werkzeug with a fixed pool of worker threads, so a
+long upload from one phone no longer blocks every other request, and keeps
+HTTP/1.1 connections alive between requests so a page's many small requests
+share one connection (and one TLS handshake). Optional production servers
+(cheroot, waitress) can be selected by name when installed.
+"""
+import queue
+import socket
+import ssl
+import threading
+from typing import Optional
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+
+class ConnectionStats:
+    """Counters of connections, requests and TLS handshakes, in total and per client address."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.handshakes = 0
+        self.resumed_handshakes = 0
+        self.failed_handshakes = 0
+        self.clients = {}
+
+    def _client(self, ip: str) -> dict:
+        return self.clients.setdefault(
+            ip, {"connections": 0, "requests": 0, "handshakes": 0, "resumed_handshakes": 0}
+        )
+
+    def record_connection(self, ip: str):
+        with self._lock:
+            self.connections += 1
+            self._client(ip)["connections"] += 1
+
+    def record_request(self, ip: str):
+        with self._lock:
+            self.requests += 1
+            self._client(ip)["requests"] += 1
+
+    def record_handshake(self, ip: str, resumed: bool):
+        with self._lock:
+            self.handshakes += 1
+            client = self._client(ip)
+            client["handshakes"] += 1
+            if resumed:
+                self.resumed_handshakes += 1
+                client["resumed_handshakes"] += 1
+
+    def record_failed_handshake(self):
+        with self._lock:
+            self.failed_handshakes += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "connections": self.connections,
+                "requests": self.requests,
+                "handshakes": self.handshakes,
+                "resumed_handshakes": self.resumed_handshakes,
+                "failed_handshakes": self.failed_handshakes,
+                "clients": {ip: dict(c) for ip, c in self.clients.items()},
+            }
+
+
+class _CountingInput:
+    """Wraps wsgi.input to know whether the request body was read completely."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self.consumed = 0
+
+    def read(self, *args):
+        data = self._stream.read(*args)
+        self.consumed += len(data)
+        return data
+
+    def readline(self, *args):
+        data = self._stream.readline(*args)
+        self.consumed += len(data)
+        return data
+
+    def readinto(self, b):
+        n = self._stream.readinto(b)
+        self.consumed += n or 0
+        return n
+
+    def __iter__(self):
+        return iter(self.readline, b"")
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class _DrainGuard:
+    """Stands in for rfile while a response is sent: no draining unless the connection closes."""
+
+    def __init__(self, handler, rfile):
+        self._handler = handler
+        self._rfile = rfile
+
+    def read(self, *args):
+        if not self._handler.close_connection:
+            return b""
+        return self._rfile.read(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._rfile, name)
+
+
+class KeepAliveRequestHandler(WSGIRequestHandler):
+    """
+    werkzeug's handler always answers `Connection: close`. This one keeps an
+    HTTP/1.1 connection open for the next request when that is safe: the client
+    did not ask to close, the request body was fully read, the per-connection
+    request limit is not reached and the server is below its keep-alive cap.
+    Between requests the connection waits at most `keepalive_timeout` seconds.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.requests_handled = 0
+        self._input = None
+        self._handshake_failed = False
+        ip = self.client_address[0] if self.client_address else ""
+        self.server.stats.record_connection(ip)
+        if isinstance(self.connection, ssl.SSLSocket):
+            try:
+                self.connection.do_handshake()
+            except (ssl.SSLError, OSError):
+                # Typically a phone refusing the self-signed certificate
+                self._handshake_failed = True
+                self.server.stats.record_failed_handshake()
+                return
+            self.server.stats.record_handshake(ip, self.connection.session_reused)
+
+    def handle(self):
+        if not self._handshake_failed:
+            super().handle()
+
+    def handle_one_request(self):
+        self._input = None
+        if self.requests_handled:
+            # Idle on a kept-alive connection: wait briefly for the next request
+            self.connection.settimeout(self.server.keepalive_timeout)
+            self.server.track_idle(self.connection, True)
+            try:
+                if self.server.stopped or not self.rfile.peek(1):
+                    self.close_connection = True
+                    return
+            except (socket.timeout, OSError):
+                self.close_connection = True
+                return
+            finally:
+                self.server.track_idle(self.connection, False)
+                self.connection.settimeout(self.timeout)
+        super().handle_one_request()
+
+    def make_environ(self):
+        environ = super().make_environ()
+        self.requests_handled += 1
+        self.server.stats.record_request(environ.get("REMOTE_ADDR", ""))
+        self._input = _CountingInput(environ["wsgi.input"])
+        environ["wsgi.input"] = self._input
+        # After the response werkzeug drains whatever is left on the socket,
+        # which on a kept-alive connection is the next request. The app reads
+        # through wsgi.input, so only that drain sees this guard.
+        self._rfile = self.rfile
+        self.rfile = _DrainGuard(self, self._rfile)
+        return environ
+
+    def run_wsgi(self):
+        try:
+            super().run_wsgi()
+        finally:
+            if isinstance(self.rfile, _DrainGuard):
+                self.rfile = self._rfile
+
+    def _may_keep_alive(self) -> bool:
+        if self.close_connection or self._input is None or self.server.stopped:
+            return False
+        if self.requests_handled >= self.server.max_keepalive_requests:
+            return False
+        if self.server.active_connections > self.server.max_keepalive:
+            return False
+        if "chunked" in (self.headers.get("Transfer-Encoding") or "").lower():
+            return False
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            return False
+        # Unread body bytes would be taken for the next request line
+        return self._input.consumed >= length
+
+    def send_header(self, keyword, value):
+        if keyword.lower() == "connection" and value.lower() == "close" and self._may_keep_alive():
+            keyword, value = "Keep-Alive", f"timeout={int(self.server.keepalive_timeout)}"
+        super().send_header(keyword, value)
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """werkzeug server dispatching accepted connections to a bounded worker pool.
+
+    Accepted sockets wait in a queue of at most `queue_size` entries; when it is
+    full the accept loop waits and further clients wait in the listen backlog.
+    Once shutdown() is called, a connection still waiting for a queue slot is
+    closed instead, so the accept loop can always exit.
+    Connections are kept alive (see KeepAliveRequestHandler) while at most
+    `max_keepalive` are open, leaving workers free for new clients.
+    """
+
+    multithread = True
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        app,
+        workers: int = 8,
+        queue_size: int = 64,
+        timeout: Optional[float] = 30.0,
+        ssl_context=None,
+        keepalive_timeout: float = 5.0,
+        max_keepalive: Optional[int] = None,
+        max_keepalive_requests: int = 100,
+    ):
+        # Listen backlog, read by server_activate() during super().__init__
+        self.request_queue_size = queue_size
+        handler = type("TimeoutRequestHandler", (KeepAliveRequestHandler,), {"timeout": timeout})
+        self.keepalive_timeout = keepalive_timeout
+        self.max_keepalive = max_keepalive if max_keepalive is not None else max(1, workers - 2)
+        self.max_keepalive_requests = max_keepalive_requests
+        self.active_connections = 0
+        self.stats = ConnectionStats()
+        self._active_lock = threading.Lock()
+        self._pending = queue.Queue(maxsize=queue_size)
+        self._stopped = threading.Event()
+        self._closing = threading.Event()  # no new connections are queued
+        self._idle = set()  # kept-alive connections waiting for their next request
+        super().__init__(host, port, app, handler=handler, ssl_context=ssl_context)
+        if ssl_context is not None:
+            # Defer the TLS handshake to the worker thread (bounded by the
+            # per-connection timeout) instead of running it in the accept loop
+            self.socket.do_handshake_on_connect = False
+        self._workers = []
+        for i in range(max(1, workers)):
+            t = threading.Thread(
+                target=self._worker, name=f"fibridge-worker-{i}", daemon=True
+            )
+            t.start()
+            self._workers.append(t)
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped.is_set()
+
+    def process_request(self, request, client_address):
+        # Wait for a free slot, but never past shutdown(): serve_forever runs
+        # this on its own loop and could not notice the shutdown request
+        while not self._closing.is_set():
+            try:
+                self._pending.put((request, client_address), timeout=0.5)
+                return
+            except queue.Full:
+                continue
+        self.shutdown_request(request)
+
+    def shutdown(self):
+        self._closing.set()
+        super().shutdown()
+
+    def track_idle(self, connection, idle: bool):
+        with self._active_lock:
+            if idle:
+                self._idle.add(connection)
+            else:
+                self._idle.discard(connection)
+
+    def _worker(self):
+        while not self._stopped.is_set():
+            try:
+                request, client_address = self._pending.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            with self._active_lock:
+                self.active_connections += 1
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                with self._active_lock:
+                    self.active_connections -= 1
+                self.shutdown_request(request)
+
+    def server_close(self):
+        self._closing.set()
+        self._stopped.set()
+        super().server_close()
+        # Wake idle kept-alive connections so their workers exit now
+        with self._active_lock:
+            idle = list(self._idle)
+        for connection in idle:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        # Drop connections that were accepted but never picked up
+        while True:
+            try:
+                request, _ = self._pending.get_nowait()
+            except queue.Empty:
+                break
+            self.shutdown_request(request)
+
+
+class ServingBackend:
+    """
+    Base class of serving backends.
+    make_server() returns an object exposing serve_forever() and shutdown().
+    """
+
+    name = "base"
+
+    def __init__(
+        self, workers: int = 8, queue_size: int = 64, timeout: Optional[float] = 30.0
+    ):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+
+    def make_server(self, host: str, port: int, app, ssl_context=None):
+        raise NotImplementedError
+
+
+class WerkzeugBackend(ServingBackend):
+    """Built-in werkzeug server with a worker thread pool (default)."""
+
+    name = "werkzeug"
+
+    def make_server(self, host, port, app, ssl_context=None):
+        return PooledWSGIServer(
+            host,
+            port,
+            app,
+            workers=self.workers,
+            queue_size=self.queue_size,
+            timeout=self.timeout,
+            ssl_context=ssl_context,
+        )
+
+
+class _CherootServer:
+    def __init__(self, server):
+        self.server = server
+
+    def serve_forever(self):
+        # prepare() already bound the socket in make_server
+        self.server.serve()
+
+    def shutdown(self):
+        self.server.stop()
+
+    def server_close(self):
+        pass
+
+
+class CherootBackend(ServingBackend):
+    """cheroot (CherryPy's WSGI server), supports TLS."""
+
+    name = "cheroot"
+
+    def make_server(self, host, port, app, ssl_context=None):
+        try:
+            from cheroot import wsgi
+            from cheroot.ssl.builtin import BuiltinSSLAdapter
+        except ImportError:
+            raise RuntimeError("cheroot is not installed; run 'pip install cheroot'")
+        server = wsgi.Server(
+            (host, port),
+            app,
+            numthreads=self.workers,
+            request_queue_size=self.queue_size,
+            accepted_queue_size=self.queue_size,
+            timeout=self.timeout or 10,
+        )
+        if isinstance(ssl_context, tuple):
+            server.ssl_adapter = BuiltinSSLAdapter(*ssl_context)
+        elif ssl_context is not None:
+            # Keep the tuned context built by ServerManager (see src.utils.tls)
+            server.ssl_adapter = BuiltinSSLAdapter(ssl_context.cert_path, ssl_context.key_path)
+            server.ssl_adapter.context = ssl_context
+        server.prepare()
+        return _CherootServer(server)
+
+
+class _WaitressServer:
+    def __init__(self, server):
+        self.server = server
+
+    def serve_forever(self):
+        self.server.run()
+
+    def shutdown(self):
+        self.server.close()
+        self.server.task_dispatcher.shutdown()
+
+    def server_close(self):
+        pass
+
+
+class WaitressBackend(ServingBackend):
+    """waitress, plain HTTP only (waitress does not terminate TLS)."""
+
+    name = "waitress"
+
+    def make_server(self, host, port, app, ssl_context=None):
+        if ssl_context is not None:
+            raise RuntimeError(
+                "waitress does not support HTTPS; choose the 'werkzeug' or 'cheroot' backend"
+            )
+        try:
+            import waitress
+        except ImportError:
+            raise RuntimeError("waitress is not installed; run 'pip install waitress'")
+        return _WaitressServer(
+            waitress.create_server(
+                app,
+                host=host,
+                port=port,
+                threads=self.workers,
+                backlog=self.queue_size,
+                channel_timeout=self.timeout or 120,
+            )
+        )
+
+
+BACKENDS = {
+    WerkzeugBackend.name: WerkzeugBackend,
+    CherootBackend.name: CherootBackend,
+    WaitressBackend.name: WaitressBackend,
+}
+
+
+def create_backend(name: str = "werkzeug", **kwargs) -> ServingBackend:
+    """Create a serving backend by name ('werkzeug', 'cheroot' or 'waitress')."""
+    try:
+        cls = BACKENDS[name.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown serving backend: {name} (choose from {', '.join(BACKENDS)})"
+        )
+    return cls(**kwargs)
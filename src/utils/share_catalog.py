@@ -0,0 +1,92 @@
+"""In-memory catalog of the files selected in the File Share tab.
+
+The catalog is rebuilt once whenever the share selection changes and maps the
+exposed file name (base name + ext) to its path and stat data, so listing and
+download lookups no longer re-stat every shared file on each request.
+"""
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+SORT_KEYS = ("name", "ext", "size", "mtime")
+
+
+class ShareCatalog:
+
+    def __init__(self):
+        self._entries: Dict[str, dict] = {}
+        self._sorted: Dict[Tuple[str, bool], List[dict]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _stat_entry(path: str) -> Optional[dict]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if not os.path.isfile(path):
+            return None
+        base = os.path.basename(path)
+        name, ext = os.path.splitext(base)
+        return {
+            "name": name,
+            "ext": ext,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "full": path,
+        }
+
+    def update(self, file_list):
+        """Rebuild the catalog from the selected paths (first path wins on duplicate names)."""
+        entries = {}
+        for f in file_list:
+            f = f.strip()
+            if not f:
+                continue
+            entry = self._stat_entry(f)
+            if entry:
+                entries.setdefault(entry["name"] + entry["ext"], entry)
+        with self._lock:
+            self._entries = entries
+            self._sorted = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, filename: str) -> Optional[dict]:
+        """
+        O(1) lookup by exposed file name. The entry is re-validated with a single
+        stat; changed files are refreshed and vanished files are dropped.
+        """
+        entry = self._entries.get(filename)
+        if entry is None:
+            return None
+        fresh = self._stat_entry(entry["full"])
+        if fresh is None or fresh["size"] != entry["size"] or fresh["mtime"] != entry["mtime"]:
+            with self._lock:
+                if fresh is None:
+                    self._entries.pop(filename, None)
+                else:
+                    self._entries[filename] = fresh
+                self._sorted = {}
+            return fresh
+        return entry
+
+    def list(
+        self, offset: int = 0, limit: Optional[int] = None, sort: str = "name", descending: bool = False
+    ) -> Tuple[List[dict], int]:
+        """Return one page of entries sorted by `sort`, plus the total entry count."""
+        if sort not in SORT_KEYS:
+            sort = "name"
+        with self._lock:
+            ordered = self._sorted.get((sort, descending))
+            if ordered is None:
+                ordered = sorted(
+                    self._entries.values(),
+                    key=lambda e: (e[sort], e["name"], e["ext"]),
+                    reverse=descending,
+                )
+                self._sorted[(sort, descending)] = ordered
+        offset = max(0, offset)
+        end = None if limit is None else offset + max(0, limit)
+        return ordered[offset:end], len(ordered)
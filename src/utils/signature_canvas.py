@@ -1,7 +1,22 @@
 from PIL import Image, ImageTk, ImageDraw, ImageChops
+from array import array
 import tkinter as tk
 import logging
 
+PEN_WIDTH = 2
+# Motion events are buffered and drawn once per frame (~60 fps)
+FRAME_MS = 16
+
+
+class Stroke:
+    """One pen stroke: its points (x0, y0, x1, y1, ...) in image coordinates and its canvas line."""
+
+    __slots__ = ("points", "item")
+
+    def __init__(self):
+        self.points = array("f")
+        self.item = None
+
 
 class SignatureCanvas(tk.Frame):
 
@@ -41,7 +56,13 @@ class SignatureCanvas(tk.Frame):
         self.draw = ImageDraw.Draw(self.image)
 
         self.mouse_pressed = False
-        self.points = []
+        # Each stroke is a single growing polyline item, so the item count
+        # (and the cost of zooming or clearing) grows with strokes, not events
+        self.strokes = []
+        self._stroke = None
+        self._pending = []  # canvas coordinates not drawn yet
+        self._flush_job = None
+        self.view_scale = 1.0  # zoom applied to the canvas items
         self.is_dirty = False  # Track if there are unsaved changes
 
     def start(self):
@@ -83,58 +104,81 @@ class SignatureCanvas(tk.Frame):
         self.canvas.bind("<ButtonRelease-1>", self._on_mouse_up)
 
     def _on_mouse_down(self, event):
+        self._end_stroke()
         self.mouse_pressed = True
-        x = self.canvas.canvasx(event.x)
-        y = self.canvas.canvasy(event.y)
-        self.last_x, self.last_y = x, y
-        self.points = [(x, y)]
+        self._stroke = Stroke()
+        self._pending = [self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)]
 
     def _on_mouse_up(self, event):
         self.mouse_pressed = False
-        self.points.clear()
-        self.last_x, self.last_y = None, None
+        self._end_stroke()
 
     def _draw_motion(self, event):
-        x = self.canvas.canvasx(event.x)
-        y = self.canvas.canvasy(event.y)
-
-        if self.mouse_pressed:
-            self.points.append((x, y))
-            if len(self.points) >= 3:
-                x1, y1 = self.points[-3]
-                x2, y2 = self.points[-2]
-                x3, y3 = self.points[-1]
-                mid_x1, mid_y1 = (x1 + x2) // 2, (y1 + y2) // 2
-                mid_x2, mid_y2 = (x2 + x3) // 2, (y2 + y3) // 2
-                self.canvas.create_line(
-                    mid_x1,
-                    mid_y1,
-                    mid_x2,
-                    mid_y2,
-                    fill="black",
-                    width=2,
-                    capstyle=tk.ROUND,
-                    smooth=True,
-                )
-                self.draw.line([mid_x1, mid_y1, mid_x2, mid_y2], fill="black", width=2)
-            self.last_x, self.last_y = x, y
+        if not self.mouse_pressed:
+            return
+        self._pending += (self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+        if self._flush_job is None:
+            self._flush_job = self.after(FRAME_MS, self._flush)
+
+    def _flush(self):
+        """Append the points buffered since the last frame to the current stroke."""
+        self._flush_job = None
+        stroke, pending = self._stroke, self._pending
+        # A line item needs two points
+        if stroke is None or not pending or (stroke.item is None and len(pending) < 4):
+            return
+        self._pending = []
+        if stroke.item is None:
+            stroke.item = self.canvas.create_line(
+                *pending,
+                fill="black",
+                width=PEN_WIDTH,
+                capstyle=tk.ROUND,
+                joinstyle=tk.ROUND,
+                smooth=True,
+                tags="stroke",
+            )
         else:
-            self.last_x, self.last_y = None, None
-            self.points.clear()
+            self.canvas.insert(stroke.item, "end", pending)
+        # The model and the PIL image use unzoomed coordinates
+        points = [v / self.view_scale for v in pending]
+        segment = list(stroke.points[-2:]) + points
+        stroke.points.extend(points)
+        if len(segment) >= 4:
+            self.draw.line(segment, fill="black", width=PEN_WIDTH, joint="curve")
         self.is_dirty = True
 
+    def _end_stroke(self):
+        if self._flush_job is not None:
+            self.after_cancel(self._flush_job)
+            self._flush_job = None
+        self._flush()
+        if self._stroke is not None and self._stroke.item is not None:
+            self.strokes.append(self._stroke)
+        self._stroke = None
+        self._pending = []
+
     def _stop_drawing(self, event):
         self.mouse_pressed = False
-        self.last_x, self.last_y = None, None
-        self.points.clear()
+        self._end_stroke()
+
+    def scale_view(self, factor):
+        """Zoom the drawing; strokes keep their image coordinates."""
+        self.canvas.scale(tk.ALL, 0, 0, factor, factor)
+        self.view_scale *= factor
 
     def clear(self):
+        if self._flush_job is not None:
+            self.after_cancel(self._flush_job)
+            self._flush_job = None
         self.canvas.delete("all")
         self.image = Image.new("RGBA", (self.width, self.height), (255, 255, 255, 0))
         self.draw = ImageDraw.Draw(self.image)
 
-        self.last_x, self.last_y = None, None
-        self.points.clear()
+        self.strokes = []
+        self._stroke = None
+        self._pending = []
+        self.view_scale = 1.0
         self.canvas.create_rectangle(
             5, 5, self.width - 5, self.height - 5, dash=(3, 2), outline="gray"
         )
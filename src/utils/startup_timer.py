@@ -0,0 +1,33 @@
+"""Startup timing: named phases measured during launch, for regression checks."""
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+
+class StartupTimer:
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def measure(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def mark(self, name: str):
+        """Record the time elapsed since the timer was created."""
+        self.phases.append((name, time.perf_counter() - self.origin))
+
+    def report(self) -> str:
+        width = max((len(name) for name, _ in self.phases), default=0)
+        lines = ["Startup timing:"]
+        lines += [f"  {name:<{width}}  {seconds * 1000:8.1f} ms" for name, seconds in self.phases]
+        return "\n".join(lines)
+
+
+# Shared by main.py and the App so both sides land in one report
+startup_timer = StartupTimer()
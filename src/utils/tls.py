@@ -0,0 +1,190 @@
+"""TLS setup for the file server.
+
+create_server_context() builds the server SSLContext: TLS 1.2+ with forward
+secret AEAD ciphers only, AES-GCM preferred unless the client ranks
+ChaCha20-Poly1305 first (phones without AES hardware do), and session tickets
+so reconnecting phones resume instead of doing a full handshake. RSA and
+ECDSA keys both work.
+
+ensure_certificate() creates a self-signed ECDSA P-256 certificate in
+process (with `cryptography`, or the openssl command as a fallback) when none
+exists, and renews certificates it generated itself (self-signed, CN
+"FiBridge") when they are about to expire. Certificates supplied by the user
+are never renewed, an expiring one is only reported; an unreadable pair is
+moved aside to `<name>.bad` and a new certificate is generated.
+"""
+import datetime
+import importlib.util
+import ipaddress
+import os
+import shutil
+import ssl
+import logging
+import subprocess
+from typing import Callable, Iterable, Optional, Tuple
+
+TLS12_CIPHERS = ":".join(
+    [
+        "ECDHE-ECDSA-AES128-GCM-SHA256",
+        "ECDHE-RSA-AES128-GCM-SHA256",
+        "ECDHE-ECDSA-CHACHA20-POLY1305",
+        "ECDHE-RSA-CHACHA20-POLY1305",
+        "ECDHE-ECDSA-AES256-GCM-SHA384",
+        "ECDHE-RSA-AES256-GCM-SHA384",
+    ]
+)
+# SSL_OP_PRIORITIZE_CHACHA: with server preference, pick ChaCha20 when the client lists it first
+_OP_PRIORITIZE_CHACHA = 0x00200000
+
+CERT_DAYS = 825
+# Subject and issuer of the certificates generated here; only these are renewed
+CERT_COMMON_NAME = "FiBridge"
+# Regenerate when the certificate expires within this many days
+CERT_RENEW_DAYS = 7
+
+
+class ServerSSLContext(ssl.SSLContext):
+    """SSLContext that remembers the certificate files it was loaded from."""
+
+    cert_path = None
+    key_path = None
+
+
+def create_server_context(cert_path: str, key_path: str) -> ServerSSLContext:
+    ctx = ServerSSLContext(ssl.PROTOCOL_TLS_SERVER)
+    ctx.minimum_version = ssl.TLSVersion.TLSv1_2
+    ctx.set_ciphers(TLS12_CIPHERS)
+    ctx.options |= ssl.OP_CIPHER_SERVER_PREFERENCE | _OP_PRIORITIZE_CHACHA
+    # Session tickets (TLS 1.2 and 1.3) for resumption
+    ctx.options &= ~ssl.OP_NO_TICKET
+    ctx.num_tickets = 2
+    ctx.load_cert_chain(cert_path, key_path)
+    ctx.cert_path = cert_path
+    ctx.key_path = key_path
+    return ctx
+
+
+def can_generate_certificate() -> bool:
+    # find_spec avoids importing cryptography just to answer this
+    return importlib.util.find_spec("cryptography") is not None or shutil.which("openssl") is not None
+
+
+def _cert_info(cert_path: str) -> Optional[Tuple[datetime.datetime, bool]]:
+    """
+    (expiry, generated by this module) of a PEM certificate, or None without
+    `cryptography`. Raises ValueError when the file is not a valid certificate.
+    """
+    try:
+        from cryptography import x509
+        from cryptography.x509.oid import NameOID
+    except ImportError:
+        return None
+    with open(cert_path, "rb") as f:
+        cert = x509.load_pem_x509_certificate(f.read())
+    names = [a.value for a in cert.subject.get_attributes_for_oid(NameOID.COMMON_NAME)]
+    generated = cert.issuer == cert.subject and names == [CERT_COMMON_NAME]
+    expiry = getattr(cert, "not_valid_after_utc", None)
+    if expiry is None:
+        # cryptography < 42 only has the naive UTC datetime
+        expiry = cert.not_valid_after.replace(tzinfo=datetime.timezone.utc)
+    return expiry, generated
+
+
+def _generate_with_cryptography(cert_path, key_path, hosts, days):
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, CERT_COMMON_NAME)])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    san = [x509.DNSName("localhost")] + [x509.IPAddress(ipaddress.ip_address(h)) for h in hosts]
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=5))
+        .not_valid_after(now + datetime.timedelta(days=days))
+        .add_extension(x509.SubjectAlternativeName(san), critical=False)
+        .sign(key, hashes.SHA256())
+    )
+    # The private key is readable by the owner only
+    with os.fdopen(os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb") as f:
+        f.write(
+            key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            )
+        )
+    with open(cert_path, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+
+
+def _generate_with_openssl(cert_path, key_path, hosts, days):
+    openssl = shutil.which("openssl")
+    if not openssl:
+        raise RuntimeError(
+            "Cannot generate a certificate: install 'cryptography' (pip install cryptography) or openssl"
+        )
+    san = ",".join(["DNS:localhost"] + [f"IP:{h}" for h in hosts])
+    subprocess.run(
+        [
+            openssl, "req", "-x509", "-newkey", "ec", "-pkeyopt", "ec_paramgen_curve:prime256v1",
+            "-nodes", "-keyout", key_path, "-out", cert_path, "-days", str(days),
+            "-subj", f"/CN={CERT_COMMON_NAME}", "-addext", f"subjectAltName={san}",
+        ],
+        check=True,
+        capture_output=True,
+    )
+
+
+def ensure_certificate(
+    cert_path: str,
+    key_path: str,
+    hosts: Iterable[str] = (),
+    days: int = CERT_DAYS,
+    log_func: Optional[Callable[[int, str], None]] = None,
+) -> bool:
+    """
+    Make sure a usable certificate exists at `cert_path`/`key_path`, generating a
+    self-signed one for `hosts` (IP addresses) if needed. Returns True if generated.
+    """
+    if os.path.exists(cert_path) and os.path.exists(key_path):
+        try:
+            info = _cert_info(cert_path)
+        except (ValueError, OSError) as e:
+            # Unusable files are kept next to the new ones, not overwritten
+            for path in (cert_path, key_path):
+                os.replace(path, path + ".bad")
+            if log_func:
+                log_func(
+                    logging.WARNING,
+                    f"[TLS] Cannot read certificate {cert_path} ({e}); moved it to {cert_path}.bad "
+                    "and generating a new one",
+                )
+        else:
+            if info is None:
+                return False
+            expiry, generated = info
+            renew_at = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=CERT_RENEW_DAYS)
+            if expiry > renew_at:
+                return False
+            if not generated:
+                if log_func:
+                    log_func(
+                        logging.WARNING,
+                        f"[TLS] Certificate {cert_path} expires on {expiry:%Y-%m-%d}; replace it to keep HTTPS working",
+                    )
+                return False
+    hosts = sorted({h for h in hosts if h} | {"127.0.0.1"})
+    try:
+        import cryptography  # noqa: F401
+    except ImportError:
+        _generate_with_openssl(cert_path, key_path, hosts, days)
+    else:
+        _generate_with_cryptography(cert_path, key_path, hosts, days)
+    return True
@@ -0,0 +1,158 @@
+"""Streaming multipart/form-data upload into the cache directory.
+
+Each file part is written straight to its final place in `out_dir` while the
+request body is being read, so every uploaded byte hits the disk exactly once
+and memory stays bounded to one read buffer. Parts are hashed while they
+stream, so they can be committed to the content-addressed store without a
+second read.
+"""
+import hashlib
+import os
+import shutil
+import uuid
+from typing import Callable, List, Optional
+
+
+class UploadTooLargeError(RuntimeError):
+    """The request body exceeds the configured size limit or the free disk space."""
+
+
+class _PartWriter:
+    """Writes one file part to a unique `<path>.<id>.part` and moves it into place when complete."""
+
+    def __init__(self, path: str, size_hint: Optional[int] = None, store=None):
+        self.path = path
+        # Unique per writer: concurrent uploads of the same name must not share it
+        self.tmp_path = f"{path}.{uuid.uuid4().hex}.part"
+        self.size = 0
+        self.store = store
+        self.sha256 = hashlib.sha256()
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        self.fd = os.open(self.tmp_path, flags, 0o644)
+        if size_hint and hasattr(os, "posix_fallocate"):
+            # Reserve the part size up front (fails fast on a full disk, keeps
+            # the file contiguous); the excess is truncated in close()
+            try:
+                os.posix_fallocate(self.fd, 0, size_hint)
+            except OSError:
+                pass
+
+    def write(self, data: bytes):
+        view = memoryview(data)
+        while view:
+            n = os.write(self.fd, view)
+            view = view[n:]
+        self.sha256.update(data)
+        self.size += len(data)
+
+    def close(self):
+        os.ftruncate(self.fd, self.size)
+        os.close(self.fd)
+        self.fd = None
+        if self.store is not None:
+            self.store.commit(self.tmp_path, self.sha256.hexdigest(), self.path)
+        else:
+            os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+        try:
+            os.remove(self.tmp_path)
+        except OSError:
+            pass
+
+
+def check_upload_size(out_dir: str, content_length: Optional[int], max_size: Optional[int]):
+    """Reject a body before reading it when its declared size cannot be accepted."""
+    if content_length is None:
+        return
+    if max_size is not None and content_length > max_size:
+        raise UploadTooLargeError(
+            f"Upload of {content_length} bytes exceeds the limit of {max_size} bytes"
+        )
+    free = shutil.disk_usage(out_dir).free
+    if content_length > free:
+        raise UploadTooLargeError(
+            f"Upload of {content_length} bytes exceeds the free disk space ({free} bytes)"
+        )
+
+
+def stream_multipart_upload(
+    stream,
+    boundary: bytes,
+    out_dir: str,
+    content_length: Optional[int] = None,
+    max_size: Optional[int] = None,
+    buffer_size: int = 64 * 1024,
+    log_func: Optional[Callable[[str], None]] = None,
+    store=None,
+    file_count: Optional[int] = None,
+) -> List[str]:
+    """
+    Parse a multipart body from `stream` and save every file part into `out_dir`.
+    With a ContentStore as `store`, parts are deduplicated by their SHA-256.
+    When the client declares a single file part (`file_count` == 1), its file
+    is preallocated to the rest of the body; otherwise part sizes are unknown
+    and nothing is reserved.
+    Non-file form fields are skipped. Returns the saved base file names in order.
+    Raises UploadTooLargeError when the body is (or turns out to be) too large,
+    and ValueError for a malformed body; partially written files are removed.
+    """
+    check_upload_size(out_dir, content_length, max_size)
+    # Imported here so loading this module does not pull in werkzeug at startup
+    from werkzeug.sansio.multipart import (
+        Data,
+        Epilogue,
+        Field,
+        File,
+        MultipartDecoder,
+        NeedData,
+    )
+
+    decoder = MultipartDecoder(boundary)
+    saved = []
+    writer = None
+    received = 0
+    try:
+        while True:
+            chunk = stream.read(buffer_size)
+            received += len(chunk)
+            if max_size is not None and received > max_size:
+                raise UploadTooLargeError(
+                    f"Upload exceeds the limit of {max_size} bytes"
+                )
+            decoder.receive_data(chunk or None)
+            event = decoder.next_event()
+            while not isinstance(event, (NeedData, Epilogue)):
+                if isinstance(event, File):
+                    # Prevent path traversal
+                    filename = os.path.basename(event.filename or "")
+                    writer = None
+                    if filename:
+                        hint = None
+                        if content_length is not None and file_count == 1:
+                            hint = content_length - received + len(chunk)
+                        writer = _PartWriter(os.path.join(out_dir, filename), hint, store)
+                elif isinstance(event, Field):
+                    writer = None
+                elif isinstance(event, Data):
+                    if writer is not None:
+                        writer.write(event.data)
+                        if not event.more_data:
+                            writer.close()
+                            saved.append(os.path.basename(writer.path))
+                            if log_func:
+                                log_func(f"[UPLOAD] File saved: {writer.path}")
+                            writer = None
+                event = decoder.next_event()
+            if isinstance(event, Epilogue):
+                break
+            if not chunk:
+                raise ValueError("Unexpected end of multipart body")
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+    return saved
@@ -0,0 +1,193 @@
+"""On-the-fly ZIP archive streaming.
+
+Archives are generated while they are sent: no temporary archive on disk and
+memory bounded to one read buffer. Already-compressed media is stored as is,
+text-like files are deflated. When every entry is stored the exact archive
+size is known up front, so the response can carry a Content-Length.
+ZIP64 records are used for entries or offsets beyond 4 GiB.
+"""
+import os
+import struct
+import time
+import zlib
+from typing import Iterator, List, Optional
+
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP_MAX_ENTRIES = 0xFFFF
+# Deflate may slightly expand its input, keep a margin before switching to ZIP64
+DEFLATE_ZIP64_MARGIN = 1 << 20
+
+DEFLATE_EXTENSIONS = {
+    ".txt", ".csv", ".tsv", ".json", ".xml", ".html", ".htm", ".md", ".log",
+    ".ini", ".cfg", ".yaml", ".yml", ".svg", ".js", ".css", ".py", ".c", ".h",
+    ".cpp", ".java", ".sql", ".eps", ".ps", ".bmp", ".tif", ".tiff", ".wav",
+}
+
+_MARKER_32 = 0xFFFFFFFF
+_MARKER_16 = 0xFFFF
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+_STORED = 0
+_DEFLATED = 8
+
+
+def should_deflate(filename: str) -> bool:
+    """Deflate text-like and uncompressed formats; store everything else."""
+    return os.path.splitext(filename)[1].lower() in DEFLATE_EXTENSIONS
+
+
+def _dos_datetime(mtime: float):
+    t = time.localtime(mtime)
+    if t.tm_year < 1980:
+        return 0, (1 << 5) | 1  # 1980-01-01 00:00
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_time, dos_date
+
+
+class ZipEntry:
+    def __init__(self, arcname: str, path: str, size: int, mtime: float, deflate: Optional[bool] = None):
+        self.arcname = arcname
+        self.name_bytes = arcname.encode("utf-8")
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.deflate = should_deflate(arcname) if deflate is None else deflate
+        self.method = _DEFLATED if self.deflate else _STORED
+        limit = ZIP64_LIMIT - (DEFLATE_ZIP64_MARGIN if self.deflate else 0)
+        self.zip64 = size >= limit
+        self.crc = 0
+        self.compressed_size = 0 if self.deflate else size
+        self.offset = 0
+
+    def local_header(self) -> bytes:
+        dos_time, dos_date = _dos_datetime(self.mtime)
+        extra = b""
+        if self.zip64:
+            # Sizes follow in the data descriptor; the extra field marks ZIP64
+            extra = struct.pack("<HHQQ", 0x0001, 16, 0, 0)
+        return struct.pack(
+            "<IHHHHHIIIHH",
+            0x04034B50,
+            45 if self.zip64 else 20,
+            _FLAG_DATA_DESCRIPTOR | _FLAG_UTF8,
+            self.method,
+            dos_time,
+            dos_date,
+            0,
+            _MARKER_32 if self.zip64 else 0,
+            _MARKER_32 if self.zip64 else 0,
+            len(self.name_bytes),
+            len(extra),
+        ) + self.name_bytes + extra
+
+    def data_descriptor(self) -> bytes:
+        if self.zip64:
+            return struct.pack("<IIQQ", 0x08074B50, self.crc, self.compressed_size, self.size)
+        return struct.pack("<IIII", 0x08074B50, self.crc, self.compressed_size, self.size)
+
+    def central_header(self) -> bytes:
+        dos_time, dos_date = _dos_datetime(self.mtime)
+        central_zip64 = self.zip64 or self.offset >= ZIP64_LIMIT
+        extra = b""
+        if central_zip64:
+            extra = struct.pack("<HHQQQ", 0x0001, 24, self.size, self.compressed_size, self.offset)
+        return struct.pack(
+            "<IHHHHHHIIIHHHHHII",
+            0x02014B50,
+            (3 << 8) | 45,
+            45 if central_zip64 else 20,
+            _FLAG_DATA_DESCRIPTOR | _FLAG_UTF8,
+            self.method,
+            dos_time,
+            dos_date,
+            self.crc,
+            _MARKER_32 if central_zip64 else self.compressed_size,
+            _MARKER_32 if central_zip64 else self.size,
+            len(self.name_bytes),
+            len(extra),
+            0,
+            0,
+            0,
+            0o100644 << 16,
+            _MARKER_32 if central_zip64 else self.offset,
+        ) + self.name_bytes + extra
+
+
+def _end_records(count: int, cd_offset: int, cd_size: int) -> bytes:
+    records = b""
+    if count >= ZIP_MAX_ENTRIES or cd_offset >= ZIP64_LIMIT or cd_size >= ZIP64_LIMIT:
+        zip64_eocd_offset = cd_offset + cd_size
+        records += struct.pack(
+            "<IQHHIIQQQQ", 0x06064B50, 44, 45, 45, 0, 0, count, count, cd_size, cd_offset
+        )
+        records += struct.pack("<IIQI", 0x07064B50, 0, zip64_eocd_offset, 1)
+        count = _MARKER_16 if count >= ZIP_MAX_ENTRIES else count
+        cd_size = _MARKER_32 if cd_size >= ZIP64_LIMIT else cd_size
+        cd_offset = _MARKER_32 if cd_offset >= ZIP64_LIMIT else cd_offset
+    records += struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, count, count, cd_size, cd_offset, 0)
+    return records
+
+
+class ZipStream:
+    """
+    Iterable producing a ZIP archive of `entries` chunk by chunk.
+    Each file is read with a bounded buffer; its size must not change while streaming.
+    """
+
+    def __init__(self, entries: List[ZipEntry], buffer_size: int = 256 * 1024):
+        self.entries = entries
+        self.buffer_size = buffer_size
+
+    def content_length(self) -> Optional[int]:
+        """Exact archive size when no entry is deflated, else None."""
+        if any(e.deflate for e in self.entries):
+            return None
+        offset = 0
+        for e in self.entries:
+            e.offset = offset
+            offset += len(e.local_header()) + e.size + len(e.data_descriptor())
+        cd_size = sum(len(e.central_header()) for e in self.entries)
+        return offset + cd_size + len(_end_records(len(self.entries), offset, cd_size))
+
+    def _file_chunks(self, entry: ZipEntry) -> Iterator[bytes]:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, -15) if entry.deflate else None
+        crc = 0
+        remaining = entry.size
+        compressed = 0
+        with open(entry.path, "rb") as f:
+            while remaining > 0:
+                data = f.read(min(self.buffer_size, remaining))
+                if not data:
+                    raise IOError(f"{entry.path} shrank while it was being archived")
+                remaining -= len(data)
+                crc = zlib.crc32(data, crc)
+                if compressor:
+                    data = compressor.compress(data)
+                    if not data:
+                        continue
+                compressed += len(data)
+                yield data
+        if compressor:
+            data = compressor.flush()
+            compressed += len(data)
+            yield data
+        entry.crc = crc
+        entry.compressed_size = compressed
+
+    def __iter__(self) -> Iterator[bytes]:
+        offset = 0
+        for entry in self.entries:
+            entry.offset = offset
+            header = entry.local_header()
+            yield header
+            offset += len(header)
+            for data in self._file_chunks(entry):
+                offset += len(data)
+                yield data
+            descriptor = entry.data_descriptor()
+            offset += len(descriptor)
+            yield descriptor
+        central = b"".join(e.central_header() for e in self.entries)
+        yield central
+        yield _end_records(len(self.entries), offset, len(central))
@@ -83,6 +83,7 @@ window.onload = function() {
       formData.append('photos', blob, filename);
       const resp = await fetch('/api/file_share/upload', {
         method: 'POST',
+        headers: { 'X-Upload-Files': '1' },
         body: formData
       });
       const j = await resp.json();
@@ -38,21 +38,250 @@ document.addEventListener('DOMContentLoaded', function() {
         uploadPhotos(selectedFiles);
     });
 
-    function uploadPhotos(files) {
-        const formData = new FormData();
-        files.forEach(f => formData.append('photos', f));
-        fetch('/api/file_share/upload', {
+    // Resumable chunked upload: each file is split into chunks that are sent
+    // over several parallel connections; a re-sent batch only transfers the
+    // chunks the PC is still missing.
+    const PARALLEL_CHUNKS = 4;
+    const CHUNK_SIZE = 4 * 1024 * 1024;
+    const MAX_RETRIES = 5;
+    // Files up to this size are hashed on the phone so the PC can skip content it already holds.
+    // Above CHUNK_SIZE hashing runs in plain JS (WebCrypto cannot stream), so the cap covers
+    // photos while videos upload straight away instead of waiting for a slow hash
+    const MAX_HASH_SIZE = 16 * 1024 * 1024;
+    const chunkApi = '/api/file_share/chunked';
+    const statusSpan = document.getElementById('status');
+
+    const CRC_TABLE = (function() {
+        const table = new Uint32Array(256);
+        for (let n = 0; n < 256; n++) {
+            let c = n;
+            for (let k = 0; k < 8; k++) {
+                c = (c & 1) ? (0xEDB88320 ^ (c >>> 1)) : (c >>> 1);
+            }
+            table[n] = c >>> 0;
+        }
+        return table;
+    })();
+
+    function crc32(bytes) {
+        let crc = 0xFFFFFFFF;
+        for (let i = 0; i < bytes.length; i++) {
+            crc = CRC_TABLE[(crc ^ bytes[i]) & 0xFF] ^ (crc >>> 8);
+        }
+        return ((crc ^ 0xFFFFFFFF) >>> 0).toString(16);
+    }
+
+    function sleep(ms) {
+        return new Promise(resolve => setTimeout(resolve, ms));
+    }
+
+    async function postJson(url, body) {
+        const res = await fetch(url, {
             method: 'POST',
-            body: formData
-        })
-        .then(res => res.json())
-        .then(data => {
-            if (data.success) {
-                alert('Upload successful!');
-            } else {
-                alert('Upload failed: ' + (data.error || 'Unknown error'));
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(body)
+        });
+        const data = await res.json();
+        if (!data.success) {
+            throw new Error(data.error || 'Unknown error');
+        }
+        return data;
+    }
+
+    const SHA256_K = new Uint32Array([
+        0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+        0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+        0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+        0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+        0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+        0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+        0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+        0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2
+    ]);
+
+    // Incremental SHA-256: WebCrypto only hashes a whole buffer, which would
+    // mean holding an entire large file in memory
+    function Sha256() {
+        this.h = new Uint32Array([
+            0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19
+        ]);
+        this.w = new Uint32Array(64);
+        this.buf = new Uint8Array(64);
+        this.bufLen = 0;
+        this.length = 0;
+    }
+
+    Sha256.prototype.block = function(bytes, pos) {
+        const w = this.w;
+        const h = this.h;
+        for (let i = 0; i < 16; i++, pos += 4) {
+            w[i] = (bytes[pos] << 24) | (bytes[pos + 1] << 16) | (bytes[pos + 2] << 8) | bytes[pos + 3];
+        }
+        for (let i = 16; i < 64; i++) {
+            const a = w[i - 15];
+            const b = w[i - 2];
+            const s0 = ((a >>> 7) | (a << 25)) ^ ((a >>> 18) | (a << 14)) ^ (a >>> 3);
+            const s1 = ((b >>> 17) | (b << 15)) ^ ((b >>> 19) | (b << 13)) ^ (b >>> 10);
+            w[i] = w[i - 16] + s0 + w[i - 7] + s1;
+        }
+        let a = h[0], b = h[1], c = h[2], d = h[3], e = h[4], f = h[5], g = h[6], k = h[7];
+        for (let i = 0; i < 64; i++) {
+            const t1 = (k + (((e >>> 6) | (e << 26)) ^ ((e >>> 11) | (e << 21)) ^ ((e >>> 25) | (e << 7)))
+                + ((e & f) ^ (~e & g)) + SHA256_K[i] + w[i]) | 0;
+            const t2 = ((((a >>> 2) | (a << 30)) ^ ((a >>> 13) | (a << 19)) ^ ((a >>> 22) | (a << 10)))
+                + ((a & b) ^ (a & c) ^ (b & c))) | 0;
+            k = g; g = f; f = e; e = (d + t1) | 0;
+            d = c; c = b; b = a; a = (t1 + t2) | 0;
+        }
+        h[0] += a; h[1] += b; h[2] += c; h[3] += d; h[4] += e; h[5] += f; h[6] += g; h[7] += k;
+    };
+
+    Sha256.prototype.update = function(bytes) {
+        let pos = 0;
+        this.length += bytes.length;
+        if (this.bufLen) {
+            pos = Math.min(64 - this.bufLen, bytes.length);
+            this.buf.set(bytes.subarray(0, pos), this.bufLen);
+            this.bufLen += pos;
+            if (this.bufLen < 64) {
+                return;
             }
-        })
-        .catch(() => alert('Upload failed, please try again!'));
+            this.block(this.buf, 0);
+            this.bufLen = 0;
+        }
+        for (; pos + 64 <= bytes.length; pos += 64) {
+            this.block(bytes, pos);
+        }
+        this.buf.set(bytes.subarray(pos), 0);
+        this.bufLen = bytes.length - pos;
+    };
+
+    Sha256.prototype.hex = function() {
+        const bits = this.length * 8;
+        const pad = new Uint8Array((this.bufLen < 56 ? 64 : 128) - this.bufLen);
+        pad[0] = 0x80;
+        const view = new DataView(pad.buffer);
+        view.setUint32(pad.length - 8, Math.floor(bits / 0x100000000));
+        view.setUint32(pad.length - 4, bits >>> 0);
+        this.update(pad);
+        return Array.from(this.h).map(v => v.toString(16).padStart(8, '0')).join('');
+    };
+
+    async function sha256Hex(file) {
+        if (file.size <= CHUNK_SIZE && window.crypto && crypto.subtle) {
+            const digest = await crypto.subtle.digest('SHA-256', await file.arrayBuffer());
+            return Array.from(new Uint8Array(digest))
+                .map(b => b.toString(16).padStart(2, '0')).join('');
+        }
+        // Larger files are read one chunk at a time, so memory stays bounded
+        const hash = new Sha256();
+        for (let offset = 0; offset < file.size; offset += CHUNK_SIZE) {
+            hash.update(new Uint8Array(await file.slice(offset, offset + CHUNK_SIZE).arrayBuffer()));
+        }
+        return hash.hex();
+    }
+
+    // Ask the PC which files it already has; returns the names it linked without upload
+    async function skipCachedFiles(files) {
+        const items = [];
+        for (const file of files) {
+            if (file.size <= MAX_HASH_SIZE) {
+                try {
+                    items.push({ filename: file.name, sha256: await sha256Hex(file) });
+                } catch (e) {
+                    // Hashing is an optimisation only, upload the file normally
+                }
+            }
+        }
+        if (!items.length) {
+            return [];
+        }
+        try {
+            return (await postJson('/api/file_share/have', { files: items })).linked;
+        } catch (e) {
+            return [];
+        }
+    }
+
+    async function initUpload(file) {
+        return postJson(chunkApi + '/init', {
+            filename: file.name,
+            size: file.size,
+            chunk_size: CHUNK_SIZE,
+            key: [file.name, file.size, file.lastModified].join(':')
+        });
+    }
+
+    async function sendChunk(file, session, offset) {
+        const length = Math.min(session.chunk_size, file.size - offset);
+        const body = await file.slice(offset, offset + length).arrayBuffer();
+        const checksum = crc32(new Uint8Array(body));
+        for (let attempt = 0; ; attempt++) {
+            try {
+                const res = await fetch(chunkApi + '/' + session.upload_id + '?offset=' + offset, {
+                    method: 'PUT',
+                    headers: { 'X-Chunk-CRC32': checksum },
+                    body: body
+                });
+                const data = await res.json();
+                if (data.success) {
+                    return;
+                }
+                throw new Error(data.error || 'Chunk rejected');
+            } catch (e) {
+                if (attempt >= MAX_RETRIES) {
+                    throw e;
+                }
+                await sleep(500 * Math.pow(2, attempt));
+            }
+        }
+    }
+
+    async function uploadPhotos(files) {
+        sendBtn.disabled = true;
+        try {
+            statusSpan.textContent = 'Checking files...';
+            const linked = await skipCachedFiles(files);
+            const sessions = [];
+            const queue = [];
+            let total = 0;
+            let done = 0;
+            for (const file of files.filter(f => !linked.includes(f.name))) {
+                const session = await initUpload(file);
+                sessions.push(session);
+                total += file.size;
+                // Only the missing ranges are queued, which makes a retry resume
+                session.missing.forEach(([start, length]) => {
+                    for (let offset = start; offset < start + length; offset += session.chunk_size) {
+                        queue.push({ file, session, offset });
+                    }
+                });
+                done += file.size - session.missing.reduce((n, r) => n + r[1], 0);
+            }
+            async function worker() {
+                while (queue.length) {
+                    const job = queue.shift();
+                    await sendChunk(job.file, job.session, job.offset);
+                    done += Math.min(job.session.chunk_size, job.file.size - job.offset);
+                    statusSpan.textContent = 'Uploading... ' + (total ? Math.floor(done * 100 / total) : 100) + '%';
+                }
+            }
+            const workers = [];
+            for (let i = 0; i < PARALLEL_CHUNKS; i++) {
+                workers.push(worker());
+            }
+            await Promise.all(workers);
+            await postJson(chunkApi + '/finalize', {
+                uploads: sessions.map(s => s.upload_id),
+                files: linked
+            });
+            statusSpan.textContent = 'Upload successful!';
+            alert('Upload successful!');
+        } catch (e) {
+            statusSpan.textContent = 'Upload interrupted, press Send again to resume';
+            alert('Upload failed: ' + (e.message || 'please try again!'));
+        } finally {
+            sendBtn.disabled = false;
+        }
     }
 });
\ No newline at end of file
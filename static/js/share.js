@@ -1,22 +1,66 @@
 document.addEventListener('DOMContentLoaded', function() {
     const apiBase = '/api/file_share';
 
-    function fetchFiles() {
-        fetch(apiBase + '/files')
-            .then(res => res.json())
-            .then(data => renderFiles(data))
+    const PAGE_SIZE = 200;
+    let nextOffset = 0;
+    let totalFiles = 0;
+    let sortKey = 'name';
+    let sortOrder = 'asc';
+
+    function fetchFiles(reset) {
+        if (reset) {
+            nextOffset = 0;
+        }
+        const query = '?offset=' + nextOffset + '&limit=' + PAGE_SIZE +
+            '&sort=' + sortKey + '&order=' + sortOrder;
+        fetch(apiBase + '/files' + query)
+            .then(res => {
+                totalFiles = parseInt(res.headers.get('X-Total-Count') || '0', 10);
+                return res.json();
+            })
+            .then(data => {
+                renderFiles(data, reset);
+                nextOffset += data.length;
+                document.getElementById('load-more').style.display =
+                    nextOffset < totalFiles ? 'inline-block' : 'none';
+            })
             .catch(() => alert('Can not obtain file list'));
     }
 
-    function renderFiles(files) {
+    function sortBy(key) {
+        if (sortKey === key) {
+            sortOrder = sortOrder === 'asc' ? 'desc' : 'asc';
+        } else {
+            sortKey = key;
+            sortOrder = 'asc';
+        }
+        fetchFiles(true);
+    }
+
+    function renderFiles(files, reset) {
         const fileList = document.getElementById('file-list');
-        fileList.innerHTML = '<label>Select Files to save：</label>';
-        const table = document.createElement('table');
-        table.className = 'table table-bordered';
-        const thead = document.createElement('thead');
-        thead.innerHTML = '<table><tr><th></th><th>File Name</th><th>Extension</th><th>Size</th><th>Date</th></tr></table>';
-        table.appendChild(thead);
-        const tbody = document.createElement('tbody');
+        let tbody = document.getElementById('file-rows');
+        if (reset || !tbody) {
+            fileList.innerHTML = '<label>Select Files to save：</label>';
+            const table = document.createElement('table');
+            table.className = 'table table-bordered';
+            const thead = document.createElement('thead');
+            const headRow = document.createElement('tr');
+            headRow.appendChild(document.createElement('th'));
+            [['name', 'File Name'], ['ext', 'Extension'], ['size', 'Size'], ['mtime', 'Date']].forEach(([key, label]) => {
+                const th = document.createElement('th');
+                th.textContent = label + (sortKey === key ? (sortOrder === 'asc' ? ' ▲' : ' ▼') : '');
+                th.style.cursor = 'pointer';
+                th.addEventListener('click', () => sortBy(key));
+                headRow.appendChild(th);
+            });
+            thead.appendChild(headRow);
+            table.appendChild(thead);
+            tbody = document.createElement('tbody');
+            tbody.id = 'file-rows';
+            table.appendChild(tbody);
+            fileList.appendChild(table);
+        }
         files.forEach(file => {
             const tr = document.createElement('tr');
             // Checkbox cell
@@ -42,9 +86,7 @@ document.addEventListener('DOMContentLoaded', function() {
             tr.appendChild(tdDate);
             tbody.appendChild(tr);
         });
-        table.appendChild(tbody);
-        fileList.appendChild(table);
-        document.getElementById('download-selected').disabled = files.length === 0;
+        document.getElementById('download-selected').disabled = tbody.children.length === 0;
     }
 
     function getSelectedFiles() {
@@ -58,6 +100,24 @@ document.addEventListener('DOMContentLoaded', function() {
             alert('Please select files to download');
             return;
         }
+        if (files.length > 1) {
+            // One request for the whole selection, streamed as a single ZIP
+            const form = document.createElement('form');
+            form.method = 'POST';
+            form.action = apiBase + '/zip';
+            form.style.display = 'none';
+            files.forEach(file => {
+                const input = document.createElement('input');
+                input.type = 'hidden';
+                input.name = 'filename';
+                input.value = file;
+                form.appendChild(input);
+            });
+            document.body.appendChild(form);
+            form.submit();
+            document.body.removeChild(form);
+            return;
+        }
         files.forEach(file => {
             const url = apiBase + '/download?filename=' + encodeURIComponent(file);
             const a = document.createElement('a');
@@ -70,5 +130,9 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     });
 
-    fetchFiles();
+    document.getElementById('load-more').addEventListener('click', function() {
+        fetchFiles(false);
+    });
+
+    fetchFiles(true);
 });
\ No newline at end of file
@@ -95,6 +95,7 @@ document.addEventListener('DOMContentLoaded', function() {
         formData.append('photos', blob, filename);
         fetch('/api/file_share/upload', {
             method: 'POST',
+            headers: { 'X-Upload-Files': '1' },
             body: formData
         }).then(resp => resp.json()).then(j => {
             if (j.success) {
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from src.libs import converter
+from src.libs.qr import generate_qr_image
+
+
+def _rasterize(paths, width, height):
+    """Even-odd fill of straight, axis-aligned outlines, sampled at pixel centers."""
+    crossings = np.zeros((height, width + 1), dtype=np.uint8)
+    for start, segments in paths.paths:
+        points = [start] + [segment[-2:] for segment in segments]
+        for (x0, y0), (x1, y1) in zip(points, points[1:]):
+            assert x0 == x1 or y0 == y1, f"slanted edge {(x0, y0)} -> {(x1, y1)}"
+            if x0 == x1 and y0 != y1:
+                top, bottom = sorted((int(y0), int(y1)))
+                crossings[top:bottom, int(x0)] ^= 1
+    return np.bitwise_xor.accumulate(crossings, axis=1)[:, :width] == 1
+
+
+@pytest.mark.parametrize("url, size", [("https://192.168.1.10:5000/", 600), ("https://example.com/a", 333)])
+def test_traced_qr_code_matches_bitmap(url, size):
+    gray = np.asarray(generate_qr_image(url, size).convert("L"))
+    paths = converter.trace_bitmap(gray)
+    assert all(len(segment) == 2 for _, segments in paths.paths for segment in segments)
+    traced = _rasterize(paths, gray.shape[1], gray.shape[0])
+    assert np.array_equal(traced, gray < 128)
+
+
+def test_traced_noise_matches_bitmap():
+    # Random pixels: many diagonal contacts (saddles) and nested holes
+    rng = np.random.default_rng(0)
+    gray = np.where(rng.random((37, 53)) < 0.5, 0, 255).astype(np.uint8)
+    paths = converter.trace_bitmap(gray, turdsize=0, tolerance=0)
+    assert np.array_equal(_rasterize(paths, 53, 37), gray < 128)
+
+
+def test_too_complex_bitmap_is_refused(monkeypatch):
+    monkeypatch.setattr(converter, "TRACE_MAX_EDGES", 100)
+    gray = np.full((20, 20), 255, dtype=np.uint8)
+    gray[::2, ::2] = 0
+    with pytest.raises(RuntimeError, match="potrace"):
+        converter.trace_bitmap(gray)
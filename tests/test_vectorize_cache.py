@@ -0,0 +1,43 @@
+import threading
+from concurrent.futures import Future
+
+from PIL import Image
+
+from src.libs import converter
+
+
+def _run_with_timeout(func, timeout=10):
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault("value", func()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "trace_async deadlocked"
+    return result["value"]
+
+
+def test_trace_async_small_image_does_not_deadlock():
+    converter.clear_vectorize_cache()
+    img = Image.new("L", (2, 2), 255)
+    paths = _run_with_timeout(lambda: converter.trace_async(img, backend="numpy").result())
+    assert paths.paths == []
+    assert converter.vectorize_cache_info()["size"] == 1
+
+
+def test_trace_async_with_already_completed_future(monkeypatch):
+    # A pool whose futures are finished before trace_async registers its callback
+    class InlinePool:
+        def submit(self, fn, *args):
+            future = Future()
+            future.set_result(fn(*args))
+            return future
+
+    monkeypatch.setattr(converter, "_potrace_pool", lambda: InlinePool())
+    converter.clear_vectorize_cache()
+    img = Image.new("L", (8, 8), 255)
+    img.paste(0, (2, 2, 6, 6))
+    paths = _run_with_timeout(lambda: converter.trace_async(img, backend="numpy").result())
+    assert len(paths.paths) == 1
+    assert not converter._inflight
+    # Served from the cache the second time
+    _run_with_timeout(lambda: converter.vectorize(img, "svg", backend="numpy"))
+    assert converter.vectorize_cache_info()["hits"] == 1